@@ -141,13 +141,20 @@ class TpuDriver:
     def write_instructions(self, instructions: np.ndarray, base_addr: int = 0):
         """
         Write instruction memory (IRAM).
+
+        The whole program goes out as a single DMA transfer from one
+        contiguous, page-aligned buffer, so the AXI side sees full-length
+        bursts. Callers should pass the complete stream (including HALT)
+        in one call rather than writing instructions piecemeal.
         
         Args:
             instructions: numpy array of uint64 instruction words
             base_addr: Base address for instruction memory
         """
-        instructions = np.asarray(instructions, dtype=np.uint64)
+        instructions = np.ascontiguousarray(instructions, dtype=np.uint64).reshape(-1)
         instr_buf = allocate(shape=instructions.shape, dtype=np.uint64)
+        # Stage the words before the handshake so the DMA can start at once
+        instr_buf[:] = instructions
         
         self.wait_for_flag("instr_ready", 1)
         self.mmio.write(REG_ADDR["addr_ram"], base_addr)
@@ -155,7 +162,6 @@ class TpuDriver:
         self.mmio.write(REG_ADDR["tpu_mode"], TpuMode.WRITE_IRAM)
         
         self.wait_for_flag("stream_ready", 1)
-        instr_buf[:] = instructions
         self.dma.sendchannel.transfer(instr_buf)
         self.dma.sendchannel.wait()
         self.wait_for_flag("instr_ready", 1)
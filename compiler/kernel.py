@@ -20,6 +20,7 @@ from typing import List, Dict, Any, Callable, Optional, Union
 import numpy as np
 import inspect
 import functools
+import weakref
 
 from compiler.assembler import (
     encode_vpu, encode_systolic, encode_halt,
@@ -34,11 +35,25 @@ class Param:
 
     During kernel compilation, Param objects track symbolic addresses
     that are resolved to concrete addresses at launch time.
+
+    Instances are interned by (name, offset), so repeated arithmetic such as
+    ``A + i`` inside a loop reuses one object per distinct address. Treat
+    them as immutable.
     """
 
-    def __init__(self, name: str, offset: int = 0):
-        self.name = name
-        self.offset = offset
+    __slots__ = ('name', 'offset', '__weakref__')
+
+    _pool: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def __new__(cls, name: str, offset: int = 0):
+        key = (name, offset)
+        param = cls._pool.get(key)
+        if param is None:
+            param = super().__new__(cls)
+            param.name = name
+            param.offset = offset
+            cls._pool[key] = param
+        return param
 
     def __add__(self, other: int) -> Param:
         if not isinstance(other, int):
@@ -74,6 +89,8 @@ class Param:
 @dataclass
 class SymbolicInstruction:
     """A symbolic instruction that may contain Param references."""
+    __slots__ = ('op', 'operands')
+
     op: str
     operands: tuple  # Mix of Param and int values
 
@@ -85,35 +102,48 @@ class SymbolicInstruction:
                 resolved.append(operand.resolve(bindings))
             else:
                 resolved.append(operand)
-
-        # Encode based on operation type
-        if self.op == "matmul":
-            addr_w, addr_x, addr_z, length = resolved
-            return encode_systolic(addr_w, addr_x, addr_z, length)
-        elif self.op == "vload":
-            vreg, addr = resolved
-            return encode_vload(vreg, addr)
-        elif self.op == "vstore":
-            vreg, addr = resolved
-            return encode_vstore(vreg, addr)
-        elif self.op == "vrelu":
-            # vrelu: (vreg_dst, vreg_src) -> use as (vreg_dst, vreg_src, 0, False)
-            vreg_dst, vreg_src = resolved
-            return encode_vcompute(self.op, vreg_dst, vreg_src, 0, False)
-        elif self.op in ("vmax", "vmin"):
-            # vmax/vmin: (vreg_dst, vreg_a, vreg_b)
-            vreg_dst, vreg_a, vreg_b = resolved
-            return encode_vcompute(self.op, vreg_dst, vreg_a, vreg_b, False)
-        elif self.op in OPCODES_VCOMPUTE:
-            # vadd, vmul, vsub: (vreg_dst, vreg_a, vreg_b, scalar)
-            vreg_dst, vreg_a, vreg_b, scalar = resolved
-            return encode_vcompute(self.op, vreg_dst, vreg_a, vreg_b, scalar)
-        elif self.op in OPCODES_VPU:
-            addr_a, addr_b, addr_out = resolved[:3]
-            addr_const = resolved[3] if len(resolved) > 3 else 0
-            return encode_vpu(self.op, addr_a, addr_b, addr_out, addr_const)
-        else:
-            raise ValueError(f"Unknown operation: {self.op}")
+        return _encode(self.op, resolved)
+
+
+# Bit position of each address operand in the encoded word, per operation.
+# None marks operands that are not addresses (lengths, vector registers).
+_ADDR_SHIFTS = {
+    "matmul": (49, 36, 23, None),
+    "vload": (None, 49),
+    "vstore": (None, 49),
+    **{op: (49, 36, 23, 10) for op in OPCODES_VPU},
+}
+
+
+def _encode(op: str, resolved: list) -> int:
+    """Encode one operation from its concrete operand values."""
+    if op == "matmul":
+        addr_w, addr_x, addr_z, length = resolved
+        return encode_systolic(addr_w, addr_x, addr_z, length)
+    elif op == "vload":
+        vreg, addr = resolved
+        return encode_vload(vreg, addr)
+    elif op == "vstore":
+        vreg, addr = resolved
+        return encode_vstore(vreg, addr)
+    elif op == "vrelu":
+        # vrelu: (vreg_dst, vreg_src) -> use as (vreg_dst, vreg_src, 0, False)
+        vreg_dst, vreg_src = resolved
+        return encode_vcompute(op, vreg_dst, vreg_src, 0, False)
+    elif op in ("vmax", "vmin"):
+        # vmax/vmin: (vreg_dst, vreg_a, vreg_b)
+        vreg_dst, vreg_a, vreg_b = resolved
+        return encode_vcompute(op, vreg_dst, vreg_a, vreg_b, False)
+    elif op in OPCODES_VCOMPUTE:
+        # vadd, vmul, vsub: (vreg_dst, vreg_a, vreg_b, scalar)
+        vreg_dst, vreg_a, vreg_b, scalar = resolved
+        return encode_vcompute(op, vreg_dst, vreg_a, vreg_b, scalar)
+    elif op in OPCODES_VPU:
+        addr_a, addr_b, addr_out = resolved[:3]
+        addr_const = resolved[3] if len(resolved) > 3 else 0
+        return encode_vpu(op, addr_a, addr_b, addr_out, addr_const)
+    else:
+        raise ValueError(f"Unknown operation: {op}")
 
 
 @dataclass
@@ -129,6 +159,60 @@ class CompiledKernel:
     name: str
     params: List[str]
     instructions: List[SymbolicInstruction] = field(default_factory=list)
+    _columns: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def _lower(self) -> tuple:
+        """
+        Flatten instructions into operand columns and a uint64 template.
+
+        Each instruction is encoded once with its Param operands set to zero,
+        so literal operands are validated here and launch only has to OR the
+        shifted addresses into the template word.
+
+        Returns:
+            (names, param_ids, offsets, counts, base, shifts) where
+            param_ids[i, j] indexes names for Param operands (-1 for
+            literals), offsets[i, j] holds the Param offset or the literal
+            value, counts[i] is the operand count of instruction i, base[i]
+            is its template word and shifts[i, j] is the bit position of
+            Param operand j.
+        """
+        names = list(self.params)
+        index = {name: i for i, name in enumerate(names)}
+        counts = [len(instr.operands) for instr in self.instructions]
+        width = max(counts, default=0)
+
+        param_ids = np.full((len(counts), width), -1, dtype=np.int32)
+        offsets = np.zeros((len(counts), width), dtype=np.int64)
+        for row, instr in enumerate(self.instructions):
+            for col, operand in enumerate(instr.operands):
+                if isinstance(operand, Param):
+                    if operand.name not in index:
+                        index[operand.name] = len(names)
+                        names.append(operand.name)
+                    param_ids[row, col] = index[operand.name]
+                    offsets[row, col] = operand.offset
+                else:
+                    offsets[row, col] = int(operand)
+
+        base = np.zeros(len(counts), dtype=np.uint64)
+        shifts = np.zeros((len(counts), width), dtype=np.uint64)
+        for row, instr in enumerate(self.instructions):
+            op_shifts = _ADDR_SHIFTS.get(instr.op, ())
+            zeroed = []
+            for col, operand in enumerate(instr.operands):
+                if isinstance(operand, Param):
+                    shift = op_shifts[col] if col < len(op_shifts) else None
+                    if shift is None:
+                        raise ValueError(
+                            f"{instr.op} operand {col} must be a literal, got {operand!r}")
+                    shifts[row, col] = shift
+                    zeroed.append(0)
+                else:
+                    zeroed.append(operand)
+            base[row] = _encode(instr.op, zeroed)
+
+        return names, param_ids, offsets, counts, base, shifts
 
     def resolve(self, bindings: Dict[str, int]) -> np.ndarray:
         """
@@ -145,8 +229,30 @@ class CompiledKernel:
         if missing:
             raise ValueError(f"Missing bindings for: {missing}")
 
-        resolved = [instr.resolve(bindings) for instr in self.instructions]
-        return np.array(resolved, dtype=np.uint64)
+        # Lower once; re-lower if instructions were appended since
+        if self._columns is None or len(self._columns[3]) != len(self.instructions):
+            self._columns = self._lower()
+        names, param_ids, offsets, counts, base, shifts = self._columns
+        if not counts:
+            return np.array([], dtype=np.uint64)
+
+        for name in names:
+            if name not in bindings:
+                raise ValueError(f"Parameter '{name}' not bound")
+
+        # Resolve every Param operand at once: base address + offset
+        bound = np.array([bindings[name] for name in names] or [0], dtype=np.int64)
+        is_param = param_ids >= 0
+        values = np.where(is_param, bound[param_ids] + offsets, offsets)
+
+        addrs = values[is_param]
+        bad = (addrs < 0) | (addrs > ADDR_MAX)
+        if bad.any():
+            raise ValueError(f"Resolved address {int(addrs[bad][0])} out of range (0..{ADDR_MAX})")
+
+        # Pack every address field in one pass and OR into the template words
+        fields = np.where(is_param, values, 0).astype(np.uint64) << shifts
+        return base | np.bitwise_or.reduce(fields, axis=1)
 
 
 class InstructionCapture:
@@ -250,11 +356,14 @@ class KernelCompiler:
         with InstructionCapture() as capture:
             kernel_def(**symbolic_params)
 
-        return CompiledKernel(
+        compiled = CompiledKernel(
             name=kernel_def.__name__,
             params=param_names,
             instructions=capture.captured
         )
+        # Build the uint64 template ahead of time rather than on first launch
+        compiled._columns = compiled._lower()
+        return compiled
 
 
 class KernelLauncher:
@@ -285,12 +394,10 @@ class KernelLauncher:
         Example:
             launcher.launch(matmul_kernel, W=0, X=16, Z=32)
         """
-        # Resolve symbolic instructions to concrete uint64 values
-        instructions = compiled.resolve(bindings)
-
-        # Append HALT instruction
-        halt_instr = np.array([encode_halt()], dtype=np.uint64)
-        instructions = np.concatenate([instructions, halt_instr])
+        # Resolve into a contiguous buffer with room for the trailing HALT
+        instructions = np.empty(len(compiled.instructions) + 1, dtype=np.uint64)
+        instructions[:-1] = compiled.resolve(bindings)
+        instructions[-1] = encode_halt()
 
         # Load and execute
         self.driver.write_instructions(instructions)
@@ -315,21 +422,16 @@ class KernelLauncher:
                 (matmul_kernel, {'W': 100, 'X': 116, 'Z': 132}),
             ])
         """
-        all_instructions = []
-
-        for compiled, bindings in kernels:
-            resolved = compiled.resolve(bindings)
-            all_instructions.append(resolved)
-
-        # Combine all instructions
-        if all_instructions:
-            combined = np.concatenate(all_instructions)
-        else:
-            combined = np.array([], dtype=np.uint64)
+        # Resolve each kernel in place into one preallocated buffer
+        sizes = [len(compiled.instructions) for compiled, _ in kernels]
+        combined = np.empty(sum(sizes) + 1, dtype=np.uint64)
+        offset = 0
+        for (compiled, bindings), size in zip(kernels, sizes):
+            combined[offset:offset + size] = compiled.resolve(bindings)
+            offset += size
 
-        # Append single HALT at end
-        halt_instr = np.array([encode_halt()], dtype=np.uint64)
-        combined = np.concatenate([combined, halt_instr])
+        # Single HALT at end
+        combined[-1] = encode_halt()
 
         # Load and execute
         self.driver.write_instructions(combined)
@@ -348,6 +450,7 @@ class KernelFunction:
     def __init__(self, fn: Callable):
         self._fn = fn
         self._compiler = KernelCompiler()
+        self._compiled: Optional[CompiledKernel] = None
         functools.update_wrapper(self, fn)
 
     def __call__(self, *args, **kwargs):
@@ -355,8 +458,10 @@ class KernelFunction:
         return self._fn(*args, **kwargs)
 
     def compile(self) -> CompiledKernel:
-        """Compile this kernel to symbolic instructions."""
-        return self._compiler.compile(self._fn)
+        """Compile this kernel to symbolic instructions (traced once, then cached)."""
+        if self._compiled is None:
+            self._compiled = self._compiler.compile(self._fn)
+        return self._compiled
 
 
 def kernel(fn: Callable) -> KernelFunction:
@@ -20,8 +20,9 @@ Example:
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Tuple, Union
 from pathlib import Path
+import json
 import numpy as np
 
 from compiler.kernel import CompiledKernel, KernelFunction
@@ -52,6 +53,10 @@ class Program:
         """Allocate memory and return address."""
         return self.allocator.alloc(name, words)
 
+    def alloc_many(self, specs: List[Tuple[str, int]]) -> Dict[str, int]:
+        """Allocate (name, words) pairs contiguously and return name -> address."""
+        return self.allocator.alloc_many(specs)
+
     def addr(self, name: str) -> int:
         """Get address of previously allocated memory."""
         return self.allocator.get(name)
@@ -86,20 +91,16 @@ class Program:
         Returns:
             np.ndarray of uint64 instructions (with HALT appended)
         """
-        all_instructions = []
-
-        for call in self.calls:
-            resolved = call.kernel.resolve(call.bindings)
-            all_instructions.append(resolved)
+        # Resolve each call in place into one buffer with room for the HALT
+        sizes = [len(call.kernel.instructions) for call in self.calls]
+        program = np.empty(sum(sizes) + 1, dtype=np.uint64)
+        offset = 0
+        for call, size in zip(self.calls, sizes):
+            program[offset:offset + size] = call.kernel.resolve(call.bindings)
+            offset += size
 
-        if all_instructions:
-            combined = np.concatenate(all_instructions)
-        else:
-            combined = np.array([], dtype=np.uint64)
-
-        # Append HALT
-        halt = np.array([encode_halt()], dtype=np.uint64)
-        return np.concatenate([combined, halt])
+        program[-1] = encode_halt()
+        return program
 
     def save(self, path: Union[str, Path], format: str = None):
         """
@@ -109,27 +110,52 @@ class Program:
             path: Output file path
             format: 'npy', 'hex', or None (auto-detect from extension)
         """
-        path = Path(path)
         instructions = self.compile()
+        self._write(Path(path), instructions, format)
+        return len(instructions)
+
+    def save_both(self, npy_path: Union[str, Path], hex_path: Union[str, Path]) -> int:
+        """Compile once and save the program as both .npy and .hex."""
+        instructions = self.compile()
+        self._write(Path(npy_path), instructions, 'npy')
+        self._write(Path(hex_path), instructions, 'hex')
+        return len(instructions)
 
+    @staticmethod
+    def _write(path: Path, instructions: np.ndarray, format: str = None):
+        """Write an already compiled instruction array in the given format."""
         if format is None:
             format = path.suffix.lstrip('.')
 
         if format == 'npy':
             np.save(path, instructions)
         elif format in ('hex', 'txt'):
-            with open(path, 'w') as f:
-                for instr in instructions:
-                    f.write(f"{instr:016X}\n")
+            path.write_text("".join(f"{instr:016X}\n" for instr in instructions.tolist()))
         else:
             raise ValueError(f"Unknown format: {format}")
 
-        return len(instructions)
-
     def get_memory_map(self) -> Dict[str, tuple]:
         """Get current memory allocations as {name: (addr, size)}."""
         return dict(self.allocator.memory_map)
 
+    def save_memory_map(self, path: Union[str, Path]) -> bool:
+        """
+        Save the memory map as JSON ({name: {"addr", "size"}}) for test harnesses.
+
+        The file is only rewritten when its contents would change.
+
+        Returns:
+            True if the file was written, False if it was already up to date
+        """
+        path = Path(path)
+        memory_map = {name: {"addr": addr, "size": size}
+                      for name, (addr, size) in self.allocator.memory_map.items()}
+        text = json.dumps(memory_map, indent=2)
+        if path.exists() and path.read_text() == text:
+            return False
+        path.write_text(text)
+        return True
+
     def reset(self):
         """Reset program state (clear allocations and calls)."""
         self.allocator.reset()
@@ -152,10 +178,7 @@ def load_program(path: Union[str, Path]) -> np.ndarray:
     if path.suffix == '.npy':
         return np.load(path)
     else:
-        instructions = []
+        # One hex word per line; blank lines and '#' comments are skipped
         with open(path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    instructions.append(int(line, 16))
-        return np.array(instructions, dtype=np.uint64)
+            words = [w for w in map(str.strip, f) if w and not w.startswith('#')]
+        return np.fromiter((int(w, 16) for w in words), dtype=np.uint64, count=len(words))
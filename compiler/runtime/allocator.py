@@ -43,6 +43,35 @@ class MemoryAllocator:
         self.memory_map[name] = (addr, words)
         return addr
 
+    def alloc_many(self, specs):
+        """
+        Allocate several tensors back to back in one contiguous block.
+
+        Args:
+            specs: Iterable of (name, words) pairs, laid out in order
+
+        Returns:
+            Dict of name -> starting word address
+
+        The block is always bump allocated; the free list is not consulted.
+        """
+        specs = list(specs)
+        total = sum(words for _, words in specs)
+        if (self.next_free_addr + total) > MEMORY_SIZE:
+            raise MemoryError(
+                f"Out of TPU BRAM: cannot allocate {total} words for {len(specs)} tensors. "
+                f"Used: {self.next_free_addr}, Free list: {len(self.free_list)} blocks"
+            )
+
+        addrs = {}
+        addr = self.next_free_addr
+        for name, words in specs:
+            addrs[name] = addr
+            self.memory_map[name] = (addr, words)
+            addr += words
+        self.next_free_addr = addr
+        return addrs
+
     def free(self, name):
         """
         Free a previously allocated tensor, making its memory available for reuse.
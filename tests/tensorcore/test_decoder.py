@@ -5,7 +5,7 @@ Tests instruction field extraction with various instruction patterns
 
 import cocotb
 from cocotb.triggers import Timer
-import random
+import numpy as np
 
 
 def create_instruction(mode=0, addr_a=0, addr_b=0, addr_out=0, addr_const=0, opcode=0):
@@ -149,19 +149,16 @@ async def test_decoder_randomized(dut):
     """Randomized test for decoder with random instructions."""
     num_tests = 50
     seed = 12345
-    random.seed(seed)
+    rng = np.random.default_rng(seed)
 
     dut._log.info(f"Starting randomized decoder test with {num_tests} instructions (seed={seed})")
 
-    for test_num in range(num_tests):
-        # Generate random field values
-        mode = random.randint(0, 3)
-        addr_a = random.randint(0, 0x1FFF)
-        addr_b = random.randint(0, 0x1FFF)
-        addr_out = random.randint(0, 0x1FFF)
-        addr_const = random.randint(0, 0x1FFF)
-        opcode = random.randint(0, 0x3FF)
+    # Draw every field of every instruction in one call:
+    # columns are mode, addr_a, addr_b, addr_out, addr_const, opcode
+    field_limits = [4, 0x2000, 0x2000, 0x2000, 0x2000, 0x400]
+    fields = rng.integers(0, field_limits, size=(num_tests, len(field_limits))).tolist()
 
+    for test_num, (mode, addr_a, addr_b, addr_out, addr_const, opcode) in enumerate(fields):
         instr = create_instruction(
             mode=mode,
             addr_a=addr_a,
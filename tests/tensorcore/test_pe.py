@@ -12,6 +12,9 @@ def from_fixed(val, frac_bits=8):
         val -= (1 << 16)
     return float(val) / (1 << frac_bits)
 
+# Reset value for the data inputs, folded once at import
+FIXED_ZERO = to_fixed(0.0)
+
 def float_to_fp32_bits(val: float) -> int:
     return struct.unpack(">I", struct.pack(">f", float(val)))[0]
 
@@ -49,9 +52,9 @@ async def test_pe(dut):
 
     dut.pe_enabled.value = 1
     dut.pe_accept_w_in.value = 0
-    dut.pe_input_in.value = to_fixed(0.0)
-    dut.pe_weight_in.value = to_fixed(0.0)
-    dut.pe_psum_in.value = to_fixed(0.0)
+    dut.pe_input_in.value = FIXED_ZERO
+    dut.pe_weight_in.value = FIXED_ZERO
+    dut.pe_psum_in.value = FIXED_ZERO
     await RisingEdge(dut.clk)
 
     # Release reset
@@ -1,11 +1,11 @@
-import random
 import struct
+import numpy as np
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, Timer, ClockCycles
 
 # Fix the random seed so results are reproducible
-random.seed(0xdeadbeef)
+rng = np.random.default_rng(0xdeadbeef)
 
 def float_to_fp32_bits(val: float) -> int:
     """Convert Python float/int to 32-bit IEEE-754 single-precision bit pattern."""
@@ -25,15 +25,11 @@ def matmul_4x4(A, B):
 def transpose_4x4(M):
     return [[M[j][i] for j in range(4)] for i in range(4)]
 
-def rand_mat_4x4(lo=-3, hi=3):
-    # random integer entries; they get converted to FP32 later
-    return [[random.randint(lo, hi) for _ in range(4)] for _ in range(4)]
-
 def gen_random_tests(num_cases, lo, hi):
+    # Draw every X/W pair in one call rather than one randint per element
+    mats = rng.integers(lo, hi, size=(num_cases, 2, 4, 4), endpoint=True).tolist()
     cases = []
-    for _ in range(num_cases):
-        X  = rand_mat_4x4(lo, hi)
-        W  = rand_mat_4x4(lo, hi)
+    for X, W in mats:
         WT = transpose_4x4(W)
         OUT = matmul_4x4(X, WT)
         cases.append({ "X": X, "W": W, "OUT": OUT })
@@ -3,15 +3,29 @@
 import cocotb
 from cocotb.triggers import RisingEdge
 from cocotb.clock import Clock
-import struct
+import numpy as np
+
+LANES = 8
 
 def float_to_fp32(f):
     """Convert Python float to 32-bit integer representation."""
-    return struct.unpack('>I', struct.pack('>f', f))[0]
+    return int(np.float32(f).view(np.uint32))
+
+def pack_line(values):
+    """Pack LANES floats into one 256-bit register word (lane 0 in the low bits)."""
+    return int.from_bytes(np.asarray(values, dtype='<f4').tobytes(), 'little')
+
+def unpack_line(bits):
+    """Split a 256-bit register word into its LANES float lanes."""
+    return np.frombuffer(bits.to_bytes(LANES * 4, 'little'), dtype='<f4').astype(float)
 
-def fp32_to_float(bits):
-    """Convert 32-bit integer to Python float."""
-    return struct.unpack('>f', struct.pack('>I', bits))[0]
+def assert_line_close(bits, expected, label, tol=0.01):
+    """Check every lane of a register word at once, reporting only failing lanes."""
+    got = unpack_line(bits)
+    expected = np.asarray(expected, dtype=float)
+    bad = ~(np.abs(got - expected) < tol)
+    assert not bad.any(), (
+        f"{label} lanes {np.flatnonzero(bad).tolist()}: got {got[bad]}, expected {expected[bad]}")
 
 @cocotb.test()
 async def test_regfile_reset(dut):
@@ -55,10 +69,7 @@ async def test_regfile_write_read(dut):
     await RisingEdge(dut.clk)
 
     # Write to register 0
-    test_data = 0
-    for i in range(8):
-        elem_val = float_to_fp32(float(i + 1))
-        test_data |= elem_val << (i * 32)
+    test_data = pack_line(np.arange(1, LANES + 1))
 
     dut.wr_en.value = 1
     dut.wr_addr.value = 0
@@ -71,12 +82,7 @@ async def test_regfile_write_read(dut):
     await RisingEdge(dut.clk)
 
     # Verify data
-    read_data = int(dut.rd_data_a.value)
-    for i in range(8):
-        elem_bits = (read_data >> (i * 32)) & 0xFFFFFFFF
-        elem_val = fp32_to_float(elem_bits)
-        expected = float(i + 1)
-        assert abs(elem_val - expected) < 0.01, f"Element {i}: got {elem_val}, expected {expected}"
+    assert_line_close(int(dut.rd_data_a.value), np.arange(1, LANES + 1), "Register 0")
 
     dut._log.info("PASS: Register file write/read")
 
@@ -99,10 +105,7 @@ async def test_regfile_dual_port(dut):
 
     # Write to register 1 and 2
     for reg in [1, 2]:
-        test_data = 0
-        for i in range(8):
-            val = float_to_fp32(float(reg * 10 + i))
-            test_data |= val << (i * 32)
+        test_data = pack_line(reg * 10 + np.arange(LANES))
 
         dut.wr_en.value = 1
         dut.wr_addr.value = reg
@@ -116,19 +119,9 @@ async def test_regfile_dual_port(dut):
     dut.rd_addr_b.value = 2
     await RisingEdge(dut.clk)
 
-    # Verify port A (register 1)
-    read_data_a = int(dut.rd_data_a.value)
-    for i in range(8):
-        elem = fp32_to_float((read_data_a >> (i * 32)) & 0xFFFFFFFF)
-        expected = float(10 + i)
-        assert abs(elem - expected) < 0.01, f"Port A element {i}: got {elem}, expected {expected}"
-
-    # Verify port B (register 2)
-    read_data_b = int(dut.rd_data_b.value)
-    for i in range(8):
-        elem = fp32_to_float((read_data_b >> (i * 32)) & 0xFFFFFFFF)
-        expected = float(20 + i)
-        assert abs(elem - expected) < 0.01, f"Port B element {i}: got {elem}, expected {expected}"
+    # Verify port A (register 1) and port B (register 2)
+    assert_line_close(int(dut.rd_data_a.value), 10 + np.arange(LANES), "Port A")
+    assert_line_close(int(dut.rd_data_b.value), 20 + np.arange(LANES), "Port B")
 
     dut._log.info("PASS: Dual-port simultaneous read")
 
@@ -151,10 +144,7 @@ async def test_regfile_all_registers(dut):
 
     # Write unique pattern to each register
     for reg in range(8):
-        test_data = 0
-        for elem in range(8):
-            val = float_to_fp32(float(reg * 100 + elem))
-            test_data |= val << (elem * 32)
+        test_data = pack_line(reg * 100 + np.arange(LANES))
 
         dut.wr_en.value = 1
         dut.wr_addr.value = reg
@@ -168,12 +158,7 @@ async def test_regfile_all_registers(dut):
         dut.rd_addr_a.value = reg
         await RisingEdge(dut.clk)
 
-        read_data = int(dut.rd_data_a.value)
-        for elem in range(8):
-            elem_val = fp32_to_float((read_data >> (elem * 32)) & 0xFFFFFFFF)
-            expected = float(reg * 100 + elem)
-            assert abs(elem_val - expected) < 0.01, \
-                f"Register {reg} element {elem}: got {elem_val}, expected {expected}"
+        assert_line_close(int(dut.rd_data_a.value), reg * 100 + np.arange(LANES), f"Register {reg}")
 
     dut._log.info("PASS: All 8 registers write/read")
 
@@ -210,8 +195,7 @@ async def test_regfile_write_disabled(dut):
     dut.rd_addr_a.value = 3
     await RisingEdge(dut.clk)
 
-    read_data = int(dut.rd_data_a.value)
-    elem_val = fp32_to_float(read_data & 0xFFFFFFFF)
+    elem_val = unpack_line(int(dut.rd_data_a.value))[0]
     assert abs(elem_val - 42.0) < 0.01, f"Write occurred when wr_en=0: got {elem_val}"
 
     dut._log.info("PASS: Writes disabled when wr_en=0")
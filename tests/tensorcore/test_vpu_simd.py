@@ -1,24 +1,66 @@
 """Functional tests for vpu_simd.sv - SIMD VPU with register file."""
 
 import cocotb
-from cocotb.triggers import RisingEdge
+from cocotb.triggers import RisingEdge, Edge, First, ReadOnly, NextTimeStep, Timer
 from cocotb.clock import Clock
-import struct
+from cocotb.utils import get_sim_time
+import numpy as np
+
+CLK_PERIOD_NS = 10
+BRAM_DEPTH = 1 << 13  # ADDR_W = 13
+LANES = 8
+
+
+async def _serve_vload(dut, handles, bram, timeout_msg):
+    """Answer VLOAD reads from bram until done.
+
+    The BRAM is modelled as it is built on the board: LANES parallel banks
+    sharing one address, so bram_addr selects a whole line and every beat
+    is naturally aligned. The response for a read of addr is bram[addr]
+    with lane i at bits [32*i +: 32].
+
+    Returns (read_addrs, cycle_count): the line address of every read in
+    issue order, and the number of clock cycles from the call until done.
+    """
+    bram_en, bram_we, bram_addr, _, done = handles
+    t_start = get_sim_time(units="ns")
+    read_addrs = []
+    while True:
+        await _wait_bram_or_done(done, bram_en, t_start + 20 * CLK_PERIOD_NS, timeout_msg)
+        if int(done.value) == 1:
+            break
 
-def float_to_fp32(f):
-    return struct.unpack('>I', struct.pack('>f', f))[0]
+        # bram_en just rose: a new parallel read has been issued
+        if int(bram_en.value) == 1 and int(bram_we.value) == 0:
+            addr = int(bram_addr.value)
+            read_addrs.append(addr)
+            resp_data = int.from_bytes(bram[addr].tobytes(), 'little')
+            await NextTimeStep()
+            dut.bram_dout.value = resp_data
+    cycle_count = int(get_sim_time(units="ns") - t_start) // CLK_PERIOD_NS
+    return read_addrs, cycle_count
 
-def fp32_to_float(bits):
-    return struct.unpack('>f', struct.pack('>I', bits))[0]
 
+def _check_vreg(dut, vreg, expected_line):
+    """Compare register vreg against one BRAM line (skipped if not exposed)."""
+    try:
+        rf_v = int(dut.regfile.mem[vreg].value)
+    except AttributeError:
+        return  # Some simulators might not expose internal arrays
+    for i in range(LANES):
+        expected = int(expected_line[i])
+        actual = (rf_v >> (i * 32)) & 0xFFFFFFFF
+        assert actual == expected, f"V{vreg}[{i}] mismatch: expected {expected:x}, got {actual:x}"
 
-@cocotb.test()
-async def test_vpu_simd_reset(dut):
-    """Test that reset brings VPU to IDLE state."""
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
 
-    # Reset
+async def _reset_and_idle(dut):
+    """Start the clock, reset with all inputs idle, and return output handles.
+
+    Returns (bram_en, bram_we, bram_addr, bram_din, done) so tests poll
+    cached handles instead of repeating dut.<name> lookups.
+    """
+    cocotb.start_soon(Clock(dut.clk, CLK_PERIOD_NS, units="ns").start())
+
     dut.rst_n.value = 0
     dut.start.value = 0
     dut.vpu_type.value = 0
@@ -30,14 +72,45 @@ async def test_vpu_simd_reset(dut):
     dut.vpu_opcode.value = 0
     dut.scalar_b.value = 0
     dut.bram_dout.value = 0
-
     await RisingEdge(dut.clk)
     dut.rst_n.value = 1
     await RisingEdge(dut.clk)
 
+    return dut.bram_en, dut.bram_we, dut.bram_addr, dut.bram_din, dut.done
+
+
+async def _wait_bram_or_done(done, bram_en, deadline_ns, timeout_msg):
+    """Sleep until bram_en toggles or done rises, then settle in ReadOnly.
+
+    Replaces per-cycle RisingEdge polling so Python only runs when the BRAM
+    port or the done flag actually changes. Fails once deadline_ns passes.
+    """
+    remaining = deadline_ns - get_sim_time(units="ns")
+    assert remaining > 0, timeout_msg
+    await First(RisingEdge(done), Edge(bram_en), Timer(remaining, "ns"))
+    await ReadOnly()
+
+
+async def _wait_done(done, max_cycles, timeout_msg):
+    """Sleep until done rises or max_cycles pass; return the cycles taken.
+
+    One First() wake-up replaces a RisingEdge(clk) poll per cycle.
+    """
+    t_start = get_sim_time(units="ns")
+    done_rise = RisingEdge(done)
+    fired = await First(done_rise, Timer(max_cycles * CLK_PERIOD_NS, "ns"))
+    assert fired is done_rise, timeout_msg
+    return int(get_sim_time(units="ns") - t_start) // CLK_PERIOD_NS
+
+
+@cocotb.test()
+async def test_vpu_simd_reset(dut):
+    """Test that reset brings VPU to IDLE state."""
+    bram_en, _, _, _, done = await _reset_and_idle(dut)
+
     # Verify idle state
-    assert int(dut.done.value) == 0, "Done should be 0 after reset"
-    assert int(dut.bram_en.value) == 0, "BRAM enable should be 0 in IDLE"
+    assert int(done.value) == 0, "Done should be 0 after reset"
+    assert int(bram_en.value) == 0, "BRAM enable should be 0 in IDLE"
 
     dut._log.info("PASS: VPU SIMD reset to IDLE")
 
@@ -45,24 +118,7 @@ async def test_vpu_simd_reset(dut):
 @cocotb.test()
 async def test_vcompute_simple(dut):
     """Test VCOMPUTE operation (without actual BRAM)."""
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-
-    # Reset
-    dut.rst_n.value = 0
-    dut.start.value = 0
-    dut.vpu_type.value = 0
-    dut.addr_a.value = 0
-    dut.addr_out.value = 0
-    dut.vreg_dst.value = 0
-    dut.vreg_a.value = 0
-    dut.vreg_b.value = 0
-    dut.vpu_opcode.value = 0
-    dut.scalar_b.value = 0
-    dut.bram_dout.value = 0
-    await RisingEdge(dut.clk)
-    dut.rst_n.value = 1
-    await RisingEdge(dut.clk)
+    _, _, _, _, done = await _reset_and_idle(dut)
 
     # Setup VCOMPUTE: V2 = V0 + V1 (registers start at zero, so result should be zero)
     dut.vpu_type.value = 3  # VCOMPUTE
@@ -77,14 +133,7 @@ async def test_vcompute_simple(dut):
     dut.start.value = 0
 
     # Wait for done signal
-    cycle_count = 0
-    while cycle_count < 20:
-        await RisingEdge(dut.clk)
-        if int(dut.done.value) == 1:
-            break
-        cycle_count += 1
-
-    assert cycle_count < 20, "VCOMPUTE timeout"
+    cycle_count = await _wait_done(done, 20, "VCOMPUTE timeout")
     assert cycle_count <= 3, f"VCOMPUTE should complete in 1-3 cycles, took {cycle_count}"
 
     dut._log.info(f"PASS: VCOMPUTE completed in {cycle_count} cycles")
@@ -93,31 +142,13 @@ async def test_vcompute_simple(dut):
 @cocotb.test()
 async def test_vload_sequential(dut):
     """Test VLOAD reading 8 sequential elements from BRAM."""
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
+    # BRAM model: one 8-lane line per address, little-endian words
+    bram = np.zeros((BRAM_DEPTH, LANES), dtype='<u4')
+    bram[100] = np.arange(10, 18, dtype=np.float32).view('<u4')
 
-    # Simple BRAM model
-    bram = {}
-    for i in range(8):
-        bram[100 + i] = float_to_fp32(float(i + 10))
-
-    # Reset
-    dut.rst_n.value = 0
-    dut.start.value = 0
-    dut.vpu_type.value = 0
-    dut.addr_a.value = 0
-    dut.addr_out.value = 0
-    dut.vreg_dst.value = 0
-    dut.vreg_a.value = 0
-    dut.vreg_b.value = 0
-    dut.vpu_opcode.value = 0
-    dut.scalar_b.value = 0
-    dut.bram_dout.value = 0
-    await RisingEdge(dut.clk)
-    dut.rst_n.value = 1
-    await RisingEdge(dut.clk)
+    handles = await _reset_and_idle(dut)
 
-    # Trigger VLOAD: V0 = BRAM[100:107] (Parallel)
+    # Trigger VLOAD: V0 = BRAM line 100 (Parallel)
     dut.vpu_type.value = 1  # VLOAD
     dut.addr_a.value = 100
     dut.vreg_dst.value = 0
@@ -126,76 +157,58 @@ async def test_vload_sequential(dut):
     await RisingEdge(dut.clk)
     dut.start.value = 0
 
-    # Simulate BRAM reads (8 words in 1 parallel beat)
-    cycle_count = 0
-    read_count = 0
-    en_prev = 0
-    while cycle_count < 20:
-        await RisingEdge(dut.clk)
-        en = int(dut.bram_en.value)
-        we = int(dut.bram_we.value)
-
-        # Check if BRAM read is active (count only on leading edge)
-        if en == 1 and we == 0:
-            if en_prev == 0:
-                addr = int(dut.bram_addr.value)
-                resp_data = 0
-                for i in range(8):
-                    val = bram.get(addr + i, 0)
-                    resp_data |= (val & 0xFFFFFFFF) << (i * 32)
-                dut.bram_dout.value = resp_data
-                read_count += 1
-        en_prev = en
-
-        if int(dut.done.value) == 1:
-            break
-        cycle_count += 1
+    # Simulate BRAM reads (8 words in 1 parallel beat). Only wake up when
+    # bram_en toggles or done rises rather than on every clock edge.
+    read_addrs, cycle_count = await _serve_vload(dut, handles, bram, "VLOAD timeout")
 
-    assert cycle_count < 20, "VLOAD timeout"
-    assert read_count == 1, f"Expected 1 parallel BRAM read, got {read_count}"
+    assert len(read_addrs) == 1, f"Expected 1 parallel BRAM read, got {len(read_addrs)}"
+    assert read_addrs == [100], f"VLOAD read line {read_addrs[0]}, expected 100"
 
-    # Verify data in register file (if possible)
-    # Using the internal regfile signal if it works in Icarus
-    # regfile.mem[0] should contain 8 words
-    try:
-        rf_v0 = dut.regfile.mem[0].value
-        for i in range(8):
-            expected = float_to_fp32(float(i + 10))
-            actual = (int(rf_v0) >> (i * 32)) & 0xFFFFFFFF
-            assert actual == expected, f"V0[{i}] mismatch: expected {expected:x}, got {actual:x}"
-    except AttributeError:
-        pass # Some simulators might not expose internal arrays
+    # Verify data in register file: regfile.mem[0] should hold the whole line
+    _check_vreg(dut, 0, bram[100])
 
     dut._log.info(f"PASS: VLOAD completed in {cycle_count} cycles with parallel read and data verification")
 
 
+@cocotb.test()
+async def test_vload_misaligned(dut):
+    """Document VLOAD behaviour for a base address that is not a multiple of 8.
+
+    The scratchpad is 8 banks wide and bram_addr indexes lines, so there is
+    no misaligned burst: addr_a=101 issues exactly one read of line 101.
+    The RTL neither rounds the address down to 96 nor splits the access.
+    """
+    bram = np.zeros((BRAM_DEPTH, LANES), dtype='<u4')
+    bram[96] = np.full(LANES, 0xDEADBEEF, dtype='<u4')
+    bram[101] = np.arange(1, 9, dtype=np.float32).view('<u4')
+
+    handles = await _reset_and_idle(dut)
+
+    dut.vpu_type.value = 1  # VLOAD
+    dut.addr_a.value = 101
+    dut.vreg_dst.value = 3
+    dut.start.value = 1
+
+    await RisingEdge(dut.clk)
+    dut.start.value = 0
+
+    read_addrs, cycle_count = await _serve_vload(dut, handles, bram, "Misaligned VLOAD timeout")
+
+    assert read_addrs == [101], f"Expected a single read of line 101, got {read_addrs}"
+    _check_vreg(dut, 3, bram[101])
+
+    dut._log.info(f"PASS: VLOAD at line 101 issued one unsplit read in {cycle_count} cycles")
+
 
 @cocotb.test()
 async def test_vstore_sequential(dut):
     """Test VSTORE writing 8 sequential elements to BRAM."""
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-
-    # BRAM model to capture writes
-    bram_writes = {}
+    # Raw (addr, 256-bit data) beats; the data is unpacked into lanes after the run
+    write_beats = []
 
-    # Reset
-    dut.rst_n.value = 0
-    dut.start.value = 0
-    dut.vpu_type.value = 0
-    dut.addr_a.value = 0
-    dut.addr_out.value = 0
-    dut.vreg_dst.value = 0
-    dut.vreg_a.value = 0
-    dut.vreg_b.value = 0
-    dut.vpu_opcode.value = 0
-    dut.scalar_b.value = 0
-    dut.bram_dout.value = 0
-    await RisingEdge(dut.clk)
-    dut.rst_n.value = 1
-    await RisingEdge(dut.clk)
+    bram_en, bram_we, bram_addr, bram_din, done = await _reset_and_idle(dut)
 
-    # Trigger VSTORE: BRAM[200:207] = V1 (Parallel)
+    # Trigger VSTORE: BRAM line 200 = V1 (Parallel)
     dut.vpu_type.value = 2  # VSTORE
     dut.addr_out.value = 200
     dut.vreg_a.value = 1
@@ -204,32 +217,30 @@ async def test_vstore_sequential(dut):
     await RisingEdge(dut.clk)
     dut.start.value = 0
 
-    # Capture BRAM writes
-    cycle_count = 0
-    write_count = 0
-    while cycle_count < 20:
-        await RisingEdge(dut.clk)
+    # Capture BRAM writes, waking only on bram_en activity or done
+    t_start = get_sim_time(units="ns")
+    while True:
+        await _wait_bram_or_done(done, bram_en, t_start + 20 * CLK_PERIOD_NS, "VSTORE timeout")
 
         # Check if BRAM write is active
-        if int(dut.bram_en.value) == 1 and int(dut.bram_we.value) == 1:
-            addr = int(dut.bram_addr.value)
-            raw_data = int(dut.bram_din.value)
-            # Parallel write: unpack 8 words
-            for i in range(8):
-                val = (raw_data >> (i * 32)) & 0xFFFFFFFF
-                bram_writes[addr + i] = val
-            write_count += 1
-
-        if int(dut.done.value) == 1:
+        if int(bram_en.value) == 1 and int(bram_we.value) == 1:
+            write_beats.append((int(bram_addr.value), int(bram_din.value)))
+
+        if int(done.value) == 1:
             break
-        cycle_count += 1
+    cycle_count = int(get_sim_time(units="ns") - t_start) // CLK_PERIOD_NS
 
-    assert cycle_count < 20, "VSTORE timeout"
+    write_count = len(write_beats)
     assert write_count == 1, f"Expected 1 parallel BRAM write, got {write_count}"
 
-    # Verify writes went to correct addresses
-    for i in range(8):
-        assert (200 + i) in bram_writes, f"Missing write to address {200 + i}"
+    # Parallel write: one beat carries the whole 8-lane line, so verify the
+    # write went to the requested line
+    written = [addr for addr, _ in write_beats]
+    assert written == [200], f"VSTORE wrote lines {written}, expected [200]"
+
+    # The stored line must match V1, lane i at bits [32*i +: 32]
+    stored_line = np.frombuffer(write_beats[0][1].to_bytes(4 * LANES, 'little'), dtype='<u4')
+    _check_vreg(dut, 1, stored_line)
 
     dut._log.info(f"PASS: VSTORE completed in {cycle_count} cycles with parallel write")
 
@@ -237,24 +248,7 @@ async def test_vstore_sequential(dut):
 @cocotb.test()
 async def test_vcompute_scalar_broadcast(dut):
     """Test scalar broadcast mode (V2 = V0 * V1[0])."""
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-
-    # Reset
-    dut.rst_n.value = 0
-    dut.start.value = 0
-    dut.vpu_type.value = 0
-    dut.addr_a.value = 0
-    dut.addr_out.value = 0
-    dut.vreg_dst.value = 0
-    dut.vreg_a.value = 0
-    dut.vreg_b.value = 0
-    dut.vpu_opcode.value = 0
-    dut.scalar_b.value = 0
-    dut.bram_dout.value = 0
-    await RisingEdge(dut.clk)
-    dut.rst_n.value = 1
-    await RisingEdge(dut.clk)
+    _, _, _, _, done = await _reset_and_idle(dut)
 
     # Setup VMUL with scalar broadcast: V2 = V0 * V1[0]
     dut.vpu_type.value = 3  # VCOMPUTE
@@ -269,14 +263,7 @@ async def test_vcompute_scalar_broadcast(dut):
     dut.start.value = 0
 
     # Wait for done
-    cycle_count = 0
-    while cycle_count < 20:
-        await RisingEdge(dut.clk)
-        if int(dut.done.value) == 1:
-            break
-        cycle_count += 1
-
-    assert cycle_count < 20, "VMUL scalar broadcast timeout"
+    cycle_count = await _wait_done(done, 20, "VMUL scalar broadcast timeout")
 
     dut._log.info(f"PASS: Scalar broadcast VMUL completed in {cycle_count} cycles")
 
@@ -284,24 +271,7 @@ async def test_vcompute_scalar_broadcast(dut):
 @cocotb.test()
 async def test_invalid_vpu_type(dut):
     """Test that invalid VPU_TYPE completes without hanging."""
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-
-    # Reset
-    dut.rst_n.value = 0
-    dut.start.value = 0
-    dut.vpu_type.value = 0
-    dut.addr_a.value = 0
-    dut.addr_out.value = 0
-    dut.vreg_dst.value = 0
-    dut.vreg_a.value = 0
-    dut.vreg_b.value = 0
-    dut.vpu_opcode.value = 0
-    dut.scalar_b.value = 0
-    dut.bram_dout.value = 0
-    await RisingEdge(dut.clk)
-    dut.rst_n.value = 1
-    await RisingEdge(dut.clk)
+    _, _, _, _, done = await _reset_and_idle(dut)
 
     # Trigger with invalid VPU_TYPE
     dut.vpu_type.value = 7  # Invalid (only 0-3 are valid)
@@ -311,13 +281,6 @@ async def test_invalid_vpu_type(dut):
     dut.start.value = 0
 
     # Should go to DONE_STATE immediately
-    cycle_count = 0
-    while cycle_count < 10:
-        await RisingEdge(dut.clk)
-        if int(dut.done.value) == 1:
-            break
-        cycle_count += 1
-
-    assert cycle_count < 10, "Invalid VPU_TYPE should complete quickly"
+    cycle_count = await _wait_done(done, 10, "Invalid VPU_TYPE should complete quickly")
 
     dut._log.info(f"PASS: Invalid VPU_TYPE handled gracefully in {cycle_count} cycles")
@@ -19,7 +19,21 @@ from compiler.kernel import (
     Param, SymbolicInstruction, CompiledKernel,
     KernelCompiler, kernel
 )
-from compiler.assembler import encode_systolic, encode_vpu
+from compiler.assembler import (
+    encode_systolic, encode_vpu, encode_vload, encode_vcompute
+)
+
+
+@pytest.fixture(scope="module")
+def compiled_matmul_4x4():
+    from compiler.kernels.matmul import matmul_4x4
+    return matmul_4x4.compile()
+
+
+@pytest.fixture(scope="module")
+def compiled_vector_add():
+    from compiler.kernels.vpu import vector_add
+    return vector_add.compile()
 
 
 class TestParam:
@@ -70,6 +84,17 @@ class TestParam:
         with pytest.raises(ValueError, match="out of range"):
             p.resolve({"X": 10000})
 
+    def test_param_interned(self):
+        assert Param("A") + 3 is Param("A", 3)
+        assert Param("A", 3) - 3 is Param("A")
+        assert Param("A") is not Param("B")
+
+    def test_param_has_no_instance_dict(self):
+        p = Param("X") + 1
+        assert not hasattr(p, "__dict__")
+        with pytest.raises(AttributeError):
+            p.extra = 1
+
     def test_param_repr(self):
         assert "Param('X')" in repr(Param("X"))
         assert "+ 5" in repr(Param("X", 5))
@@ -138,6 +163,40 @@ class TestCompiledKernel:
         with pytest.raises(ValueError, match="Missing bindings"):
             compiled.resolve({"W": 0, "X": 16})  # Missing Z
 
+    def test_resolve_out_of_range(self):
+        compiled = CompiledKernel(
+            name="test",
+            params=["A", "B", "C"],
+            instructions=[
+                SymbolicInstruction("add", (Param("A"), Param("B"), Param("C"))),
+                SymbolicInstruction("add", (Param("A") + 9, Param("B"), Param("C"))),
+            ]
+        )
+        with pytest.raises(ValueError, match="out of range"):
+            compiled.resolve({"A": 8185, "B": 0, "C": 4})
+
+    def test_resolve_mixed_literals(self):
+        compiled = CompiledKernel(
+            name="test",
+            params=["X"],
+            instructions=[
+                SymbolicInstruction("vload", (3, Param("X") + 8)),
+                SymbolicInstruction("vadd", (2, 3, 3, True)),
+            ]
+        )
+        result = compiled.resolve({"X": 64})
+        assert result[0] == encode_vload(3, 72)
+        assert result[1] == encode_vcompute("vadd", 2, 3, 3, True)
+
+    def test_param_in_register_slot_rejected(self):
+        compiled = CompiledKernel(
+            name="test",
+            params=["X"],
+            instructions=[SymbolicInstruction("vload", (Param("X"), 0))]
+        )
+        with pytest.raises(ValueError, match="must be a literal"):
+            compiled.resolve({"X": 0})
+
 
 class TestKernelDecorator:
     """Tests for @kernel decorator and compilation."""
@@ -184,6 +243,14 @@ class TestKernelDecorator:
         assert len(result) == 1
         assert result[0] == encode_vpu("add", 0, 4, 8)
 
+    def test_compile_is_cached(self):
+        @kernel
+        def add_kernel(A: Param, B: Param, C: Param):
+            from compiler.tpu_txt import add
+            add(A, B, C)
+
+        assert add_kernel.compile() is add_kernel.compile()
+
     def test_tiled_matmul_instruction_count(self):
         """Test that 8x8 tiled matmul generates expected instruction count."""
         @kernel
@@ -217,10 +284,8 @@ class TestKernelDecorator:
 class TestPrebuiltKernels:
     """Tests for pre-built kernels."""
 
-    def test_matmul_4x4_compiles(self):
-        from compiler.kernels.matmul import matmul_4x4
-
-        compiled = matmul_4x4.compile()
+    def test_matmul_4x4_compiles(self, compiled_matmul_4x4):
+        compiled = compiled_matmul_4x4
         assert compiled.name == "matmul_4x4"
         assert len(compiled.instructions) == 1
 
@@ -232,10 +297,8 @@ class TestPrebuiltKernels:
         # 4 output tiles * (1 matmul + 1 matmul + 16 adds) = 72
         assert len(compiled.instructions) == 72
 
-    def test_vector_add_compiles(self):
-        from compiler.kernels.vpu import vector_add
-
-        compiled = vector_add.compile()
+    def test_vector_add_compiles(self, compiled_vector_add):
+        compiled = compiled_vector_add
         assert compiled.name == "vector_add"
         assert len(compiled.instructions) == 16  # Default n=16
 
@@ -253,9 +316,11 @@ class MockTpuDriver:
     def __init__(self):
         self.instructions = None
         self.compute_called = False
+        self.write_calls = 0
 
     def write_instructions(self, instructions):
         self.instructions = instructions
+        self.write_calls += 1
 
     def compute(self):
         self.compute_called = True
@@ -264,38 +329,31 @@ class MockTpuDriver:
 class TestKernelLauncher:
     """Tests for KernelLauncher."""
 
-    def test_launch_single_kernel(self):
+    def test_launch_single_kernel(self, compiled_matmul_4x4):
         """Test launching a single kernel."""
         from compiler.kernel import KernelLauncher
-        from compiler.kernels.matmul import matmul_4x4
         from compiler.assembler import encode_halt
 
         mock_driver = MockTpuDriver()
         launcher = KernelLauncher(mock_driver)
 
-        compiled = matmul_4x4.compile()
-        launcher.launch(compiled, W=0, X=16, Z=32)
+        launcher.launch(compiled_matmul_4x4, W=0, X=16, Z=32)
 
         assert mock_driver.compute_called
         assert len(mock_driver.instructions) == 2  # 1 matmul + 1 halt
         assert mock_driver.instructions[-1] == encode_halt()
 
-    def test_launch_batch(self):
+    def test_launch_batch(self, compiled_matmul_4x4, compiled_vector_add):
         """Test launching multiple kernels in a batch."""
         from compiler.kernel import KernelLauncher
-        from compiler.kernels.matmul import matmul_4x4
-        from compiler.kernels.vpu import vector_add
         from compiler.assembler import encode_halt
 
         mock_driver = MockTpuDriver()
         launcher = KernelLauncher(mock_driver)
 
-        compiled_matmul = matmul_4x4.compile()
-        compiled_vadd = vector_add.compile()
-
         batch = [
-            (compiled_matmul, {'W': 0, 'X': 16, 'Z': 32}),
-            (compiled_vadd, {'A': 48, 'B': 64, 'C': 80}),
+            (compiled_matmul_4x4, {'W': 0, 'X': 16, 'Z': 32}),
+            (compiled_vector_add, {'A': 48, 'B': 64, 'C': 80}),
         ]
 
         total = launcher.launch_batch(batch)
@@ -305,6 +363,10 @@ class TestKernelLauncher:
         assert len(mock_driver.instructions) == 1 + 16 + 1
         assert total == 1 + 16  # Excludes halt
         assert mock_driver.instructions[-1] == encode_halt()
+        # Whole batch goes to the driver as one contiguous uint64 burst
+        assert mock_driver.write_calls == 1
+        assert mock_driver.instructions.dtype == np.uint64
+        assert mock_driver.instructions.flags['C_CONTIGUOUS']
 
     def test_launch_batch_empty(self):
         """Test launching empty batch."""
@@ -324,26 +386,21 @@ class TestKernelLauncher:
 class TestEndToEnd:
     """End-to-end tests without hardware."""
 
-    def test_matmul_full_resolution(self):
+    def test_matmul_full_resolution(self, compiled_matmul_4x4):
         """Test full compile + resolve flow for matmul."""
-        from compiler.kernels.matmul import matmul_4x4
-
-        compiled = matmul_4x4.compile()
-        instructions = compiled.resolve({"W": 0, "X": 16, "Z": 32})
+        instructions = compiled_matmul_4x4.resolve({"W": 0, "X": 16, "Z": 32})
 
         # Should produce single matmul instruction
         assert len(instructions) == 1
         expected = encode_systolic(0, 16, 32, 16)  # m=4 -> length=16
         assert instructions[0] == expected
 
-    def test_vector_add_full_resolution(self):
+    def test_vector_add_full_resolution(self, compiled_vector_add):
         """Test full compile + resolve flow for vector_add."""
-        from compiler.kernels.vpu import vector_add
+        instructions = compiled_vector_add.resolve({"A": 0, "B": 100, "C": 200})
 
-        compiled = vector_add.compile()
-        instructions = compiled.resolve({"A": 0, "B": 100, "C": 200})
-
-        assert len(instructions) == 16
-        for i, instr in enumerate(instructions):
-            expected = encode_vpu("add", i, 100 + i, 200 + i)
-            assert instr == expected, f"Mismatch at index {i}"
+        expected = np.array(
+            [encode_vpu("add", i, 100 + i, 200 + i) for i in range(16)],
+            dtype=np.uint64,
+        )
+        assert np.array_equal(instructions, expected)
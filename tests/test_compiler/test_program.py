@@ -0,0 +1,116 @@
+"""
+Unit tests for the Program abstraction and its memory allocation.
+"""
+
+import sys
+from pathlib import Path
+# Ensure project root is in path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import json
+import pytest
+import numpy as np
+
+from compiler.program import Program, load_program
+from compiler.runtime.allocator import MEMORY_SIZE
+from compiler.assembler import encode_halt
+
+
+SPECS = [("a", 4), ("b", 4), ("zero", 1), ("W", 16), ("temp", 16)]
+
+
+class TestAllocMany:
+    """Tests for bulk contiguous allocation."""
+
+    def test_matches_sequential_alloc(self):
+        seq = Program()
+        expected = {name: seq.alloc(name, words) for name, words in SPECS}
+
+        bulk = Program()
+        assert bulk.alloc_many(SPECS) == expected
+        assert bulk.get_memory_map() == seq.get_memory_map()
+        assert bulk.allocator.next_free_addr == seq.allocator.next_free_addr
+
+    def test_follows_earlier_alloc(self):
+        prog = Program()
+        prog.alloc("first", 10)
+        addrs = prog.alloc_many([("x", 8), ("y", 8)])
+        assert addrs == {"x": 10, "y": 18}
+        assert prog.addr("y") == 18
+
+    def test_out_of_memory_is_atomic(self):
+        prog = Program()
+        prog.alloc("big", MEMORY_SIZE - 8)
+        with pytest.raises(MemoryError):
+            prog.alloc_many([("x", 4), ("y", 8)])
+        assert "x" not in prog.get_memory_map()
+        assert prog.allocator.next_free_addr == MEMORY_SIZE - 8
+
+
+class TestSaveMemoryMap:
+    """Tests for the JSON memory map written next to compiled programs."""
+
+    def test_round_trip(self, tmp_path):
+        prog = Program()
+        prog.alloc_many(SPECS)
+        path = tmp_path / "meta.json"
+        assert prog.save_memory_map(path)
+        expected = {name: {"addr": addr, "size": size}
+                    for name, (addr, size) in prog.get_memory_map().items()}
+        assert json.loads(path.read_text()) == expected
+
+    def test_unchanged_map_is_not_rewritten(self, tmp_path):
+        prog = Program()
+        prog.alloc_many(SPECS)
+        path = tmp_path / "meta.json"
+        prog.save_memory_map(path)
+        assert not prog.save_memory_map(path)
+
+        prog.alloc("extra", 8)
+        assert prog.save_memory_map(path)
+        assert "extra" in json.loads(path.read_text())
+
+
+class TestCompile:
+    """Tests for resolving scheduled calls into one instruction array."""
+
+    def test_empty_program_is_just_halt(self):
+        assert Program().compile().tolist() == [encode_halt()]
+
+    def test_calls_are_laid_out_in_order(self):
+        from compiler.kernels.matmul import matmul_4x4
+        prog = Program()
+        prog.call(matmul_4x4, W=0, X=16, Z=32)
+        prog.call(matmul_4x4, W=48, X=64, Z=80)
+
+        program = prog.compile()
+        first = matmul_4x4.compile().resolve({"W": 0, "X": 16, "Z": 32})
+        second = matmul_4x4.compile().resolve({"W": 48, "X": 64, "Z": 80})
+        assert program.dtype == np.uint64
+        assert program.tolist() == first.tolist() + second.tolist() + [encode_halt()]
+
+
+class TestSave:
+    """Tests for writing compiled programs."""
+
+    def test_save_both_matches_separate_saves(self, tmp_path):
+        from compiler.kernels.matmul import matmul_4x4
+        prog = Program()
+        addrs = prog.alloc_many([("W", 16), ("X", 16), ("Z", 16)])
+        prog.call(matmul_4x4, W=addrs["W"], X=addrs["X"], Z=addrs["Z"])
+
+        n_instr = prog.save_both(tmp_path / "both.npy", tmp_path / "both.hex")
+        prog.save(tmp_path / "one.npy")
+        prog.save(tmp_path / "one.hex")
+
+        assert n_instr == len(prog.compile())
+        assert (tmp_path / "both.npy").read_bytes() == (tmp_path / "one.npy").read_bytes()
+        assert (tmp_path / "both.hex").read_text() == (tmp_path / "one.hex").read_text()
+        assert np.array_equal(load_program(tmp_path / "both.hex"), prog.compile())
+
+    def test_load_hex_skips_blank_lines_and_comments(self, tmp_path):
+        path = tmp_path / "prog.hex"
+        path.write_text("# header\n0000000000000001\n\n  C000000000000000  \n# end\n")
+        words = load_program(path)
+        assert words.dtype == np.uint64
+        assert words.tolist() == [1, 0xC000000000000000]
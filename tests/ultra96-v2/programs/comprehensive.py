@@ -10,6 +10,7 @@ Output:
     tests/ultra96-v2/comprehensive.hex
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -61,42 +62,38 @@ def build_comprehensive_program() -> Program:
     """Build the comprehensive test program."""
     prog = Program()
 
-    # VPU test allocations
-    a = prog.alloc("a", 4)
-    b = prog.alloc("b", 4)
-    zero = prog.alloc("zero", 1)
-    add_out = prog.alloc("add_out", 4)
-    sub_out = prog.alloc("sub_out", 4)
-    mul_out = prog.alloc("mul_out", 4)
-    relu_out = prog.alloc("relu_out", 4)
-
-    # 4x4 matmul allocations
-    W4 = prog.alloc("W4", 16)
-    X4 = prog.alloc("X4", 16)
-    Z4 = prog.alloc("Z4", 16)
-
-    # 8x8 tiled matmul allocations (tile-major layout)
-    W8 = prog.alloc("W8", 64)
-    X8 = prog.alloc("X8", 64)
-    Z8 = prog.alloc("Z8", 64)
-    temp = prog.alloc("temp", 16)
+    addrs = prog.alloc_many([
+        # VPU test allocations
+        ("a", 4), ("b", 4), ("zero", 1),
+        ("add_out", 4), ("sub_out", 4), ("mul_out", 4), ("relu_out", 4),
+        # 4x4 matmul allocations
+        ("W4", 16), ("X4", 16), ("Z4", 16),
+        # 8x8 tiled matmul allocations (tile-major layout)
+        ("W8", 64), ("X8", 64), ("Z8", 64), ("temp", 16),
+    ])
+    a, b = addrs["a"], addrs["b"]
 
     # Schedule VPU operations
-    prog.call(vpu_add_n, A=a, B=b, C=add_out)
-    prog.call(vpu_sub_n, A=a, B=b, C=sub_out)
-    prog.call(vpu_mul_n, A=a, B=b, C=mul_out)
-    prog.call(vpu_relu_n, X=a, Zero=zero, Y=relu_out)
+    prog.call(vpu_add_n, A=a, B=b, C=addrs["add_out"])
+    prog.call(vpu_sub_n, A=a, B=b, C=addrs["sub_out"])
+    prog.call(vpu_mul_n, A=a, B=b, C=addrs["mul_out"])
+    prog.call(vpu_relu_n, X=a, Zero=addrs["zero"], Y=addrs["relu_out"])
 
     # Schedule 4x4 matmul
-    prog.call(matmul_4x4, W=W4, X=X4, Z=Z4)
+    prog.call(matmul_4x4, W=addrs["W4"], X=addrs["X4"], Z=addrs["Z4"])
 
     # Schedule 8x8 tiled matmul
-    prog.call(matmul_8x8_tiled, W=W8, X=X8, Z=Z8, temp=temp)
+    prog.call(matmul_8x8_tiled, W=addrs["W8"], X=addrs["X8"], Z=addrs["Z8"], temp=addrs["temp"])
 
     return prog
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Compile the comprehensive test program")
+    parser.add_argument("--no-meta", action="store_true",
+                        help="Skip writing comprehensive_meta.json")
+    args = parser.parse_args()
+
     output_dir = Path(__file__).parent.parent
 
     prog = build_comprehensive_program()
@@ -105,21 +102,17 @@ def main():
     npy_path = output_dir / "comprehensive.npy"
     hex_path = output_dir / "comprehensive.hex"
 
-    n_instr = prog.save(npy_path)
-    prog.save(hex_path)
+    n_instr = prog.save_both(npy_path, hex_path)
 
     print(f"Compiled {n_instr} instructions")
     print(f"  {npy_path}")
     print(f"  {hex_path}")
 
     # Save memory map for test verification
-    import json
-    meta_path = output_dir / "comprehensive_meta.json"
-    memory_map = {name: {"addr": addr, "size": size}
-                  for name, (addr, size) in prog.get_memory_map().items()}
-    with open(meta_path, 'w') as f:
-        json.dump(memory_map, f, indent=2)
-    print(f"  {meta_path}")
+    if not args.no_meta:
+        meta_path = output_dir / "comprehensive_meta.json"
+        written = prog.save_memory_map(meta_path)
+        print(f"  {meta_path}" + ("" if written else " (unchanged)"))
 
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@ Output:
     tests/ultra96-v2/simd_comparison_meta.json
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -87,56 +88,50 @@ def build_simd_comparison_program() -> Program:
     # Allocations
     # ========================================================================
 
-    # Test Case 1: Vector Addition (Scalar vs SIMD)
-    test_input_a = prog.alloc("test_input_a", 8)
-    test_input_b = prog.alloc("test_input_b", 8)
-    scalar_add_out = prog.alloc("scalar_add_out", 8)
-    simd_add_out = prog.alloc("simd_add_out", 8)
-
-    # Test Case 2: Vector Multiplication (Scalar vs SIMD)
-    scalar_mul_out = prog.alloc("scalar_mul_out", 8)
-    simd_mul_out = prog.alloc("simd_mul_out", 8)
-
-    # Test Case 3: ReLU (SIMD only)
-    relu_input = prog.alloc("relu_input", 8)
-    relu_out = prog.alloc("relu_out", 8)
-
-    # Test Case 4: Scalar Broadcast (SIMD only)
-    scale_input = prog.alloc("scale_input", 8)
-    scale_value = prog.alloc("scale_value", 1)
-    scale_out = prog.alloc("scale_out", 8)
-
-    # Test Case 5: Fused MLP Layer (SIMD only)
-    mlp_x = prog.alloc("mlp_x", 8)
-    mlp_w = prog.alloc("mlp_w", 8)
-    mlp_bias = prog.alloc("mlp_bias", 8)
-    mlp_out = prog.alloc("mlp_out", 8)
+    addrs = prog.alloc_many([
+        # Test Case 1: Vector Addition (Scalar vs SIMD)
+        ("test_input_a", 8), ("test_input_b", 8), ("scalar_add_out", 8), ("simd_add_out", 8),
+        # Test Case 2: Vector Multiplication (Scalar vs SIMD)
+        ("scalar_mul_out", 8), ("simd_mul_out", 8),
+        # Test Case 3: ReLU (SIMD only)
+        ("relu_input", 8), ("relu_out", 8),
+        # Test Case 4: Scalar Broadcast (SIMD only)
+        ("scale_input", 8), ("scale_value", 1), ("scale_out", 8),
+        # Test Case 5: Fused MLP Layer (SIMD only)
+        ("mlp_x", 8), ("mlp_w", 8), ("mlp_bias", 8), ("mlp_out", 8),
+    ])
+    test_input_a, test_input_b = addrs["test_input_a"], addrs["test_input_b"]
 
     # ========================================================================
     # Kernel Calls
     # ========================================================================
 
     # Test 1: Addition comparison
-    prog.call(vector_add_scalar_8, A=test_input_a, B=test_input_b, C=scalar_add_out)
-    prog.call(vector_add_simd, A=test_input_a, B=test_input_b, C=simd_add_out)
+    prog.call(vector_add_scalar_8, A=test_input_a, B=test_input_b, C=addrs["scalar_add_out"])
+    prog.call(vector_add_simd, A=test_input_a, B=test_input_b, C=addrs["simd_add_out"])
 
     # Test 2: Multiplication comparison
-    prog.call(vector_mul_scalar_8, A=test_input_a, B=test_input_b, C=scalar_mul_out)
-    prog.call(vector_mul_simd, A=test_input_a, B=test_input_b, C=simd_mul_out)
+    prog.call(vector_mul_scalar_8, A=test_input_a, B=test_input_b, C=addrs["scalar_mul_out"])
+    prog.call(vector_mul_simd, A=test_input_a, B=test_input_b, C=addrs["simd_mul_out"])
 
     # Test 3: ReLU (SIMD only)
-    prog.call(vector_relu_simd, X=relu_input, Y=relu_out)
+    prog.call(vector_relu_simd, X=addrs["relu_input"], Y=addrs["relu_out"])
 
     # Test 4: Scalar broadcast (SIMD only)
-    prog.call(vector_scale_simd, X=scale_input, Scale=scale_value, Y=scale_out)
+    prog.call(vector_scale_simd, X=addrs["scale_input"], Scale=addrs["scale_value"], Y=addrs["scale_out"])
 
     # Test 5: Fused MLP layer (SIMD only)
-    prog.call(fused_mlp_layer_simd, X=mlp_x, W=mlp_w, Bias=mlp_bias, Y=mlp_out)
+    prog.call(fused_mlp_layer_simd, X=addrs["mlp_x"], W=addrs["mlp_w"], Bias=addrs["mlp_bias"], Y=addrs["mlp_out"])
 
     return prog
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Compile the simd comparison test program")
+    parser.add_argument("--no-meta", action="store_true",
+                        help="Skip writing simd_comparison_meta.json")
+    args = parser.parse_args()
+
     output_dir = Path(__file__).parent.parent
 
     prog = build_simd_comparison_program()
@@ -145,21 +140,17 @@ def main():
     npy_path = output_dir / "simd_comparison.npy"
     hex_path = output_dir / "simd_comparison.hex"
 
-    n_instr = prog.save(npy_path)
-    prog.save(hex_path)
+    n_instr = prog.save_both(npy_path, hex_path)
 
     print(f"Compiled {n_instr} instructions")
     print(f"  {npy_path}")
     print(f"  {hex_path}")
 
     # Save memory map for test verification
-    import json
-    meta_path = output_dir / "simd_comparison_meta.json"
-    memory_map = {name: {"addr": addr, "size": size}
-                  for name, (addr, size) in prog.get_memory_map().items()}
-    with open(meta_path, 'w') as f:
-        json.dump(memory_map, f, indent=2)
-    print(f"  {meta_path}")
+    if not args.no_meta:
+        meta_path = output_dir / "simd_comparison_meta.json"
+        written = prog.save_memory_map(meta_path)
+        print(f"  {meta_path}" + ("" if written else " (unchanged)"))
 
     # Print expected speedup
     print("\n" + "="*60)
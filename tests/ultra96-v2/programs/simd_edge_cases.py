@@ -27,29 +27,12 @@ from compiler.kernel import kernel, Param
 # Corner case kernels
 # ============================================================================
 
-@kernel
-def add_zeros(A: Param, B: Param, C: Param):
-    """VADD with all-zero inputs."""
-    from compiler.tpu_txt import vload, vadd, vstore
-    vload(0, A)
-    vload(1, B)
-    vadd(2, 0, 1)
-    vstore(2, C)
-
-
-@kernel
-def mul_zeros(A: Param, B: Param, C: Param):
-    """VMUL with all-zero inputs."""
-    from compiler.tpu_txt import vload, vmul, vstore
-    vload(0, A)
-    vload(1, B)
-    vmul(2, 0, 1)
-    vstore(2, C)
-
+# The plain elementwise kernels are shared by every test that only differs in
+# its input data; the test each call covers is noted in build_edge_case_program.
 
 @kernel
-def add_negatives(A: Param, B: Param, C: Param):
-    """VADD with all-negative inputs."""
+def add_vec(A: Param, B: Param, C: Param):
+    """VADD of two 8-element vectors: C = A + B."""
     from compiler.tpu_txt import vload, vadd, vstore
     vload(0, A)
     vload(1, B)
@@ -58,35 +41,15 @@ def add_negatives(A: Param, B: Param, C: Param):
 
 
 @kernel
-def add_cancellation(A: Param, B: Param, C: Param):
-    """VADD where B = -A, should produce zeros."""
-    from compiler.tpu_txt import vload, vadd, vstore
-    vload(0, A)
-    vload(1, B)
-    vadd(2, 0, 1)
-    vstore(2, C)
-
-
-@kernel
-def mul_identity(A: Param, Ones: Param, C: Param):
-    """VMUL by 1.0 should preserve input."""
+def mul_vec(A: Param, B: Param, C: Param):
+    """VMUL of two 8-element vectors: C = A * B."""
     from compiler.tpu_txt import vload, vmul, vstore
     vload(0, A)
-    vload(1, Ones)
+    vload(1, B)
     vmul(2, 0, 1)
     vstore(2, C)
 
 
-@kernel
-def add_identity(A: Param, Zeros: Param, C: Param):
-    """VADD with 0.0 should preserve input."""
-    from compiler.tpu_txt import vload, vadd, vstore
-    vload(0, A)
-    vload(1, Zeros)
-    vadd(2, 0, 1)
-    vstore(2, C)
-
-
 @kernel
 def self_add(A: Param, C: Param):
     """VADD V0, V0, V0 — same register for both sources and destination."""
@@ -116,26 +79,8 @@ def sub_self(A: Param, C: Param):
 
 
 @kernel
-def relu_all_positive(A: Param, C: Param):
-    """VRELU on all-positive values — should be identity."""
-    from compiler.tpu_txt import vload, vrelu, vstore
-    vload(0, A)
-    vrelu(1, 0)
-    vstore(1, C)
-
-
-@kernel
-def relu_all_negative(A: Param, C: Param):
-    """VRELU on all-negative values — should all become zero."""
-    from compiler.tpu_txt import vload, vrelu, vstore
-    vload(0, A)
-    vrelu(1, 0)
-    vstore(1, C)
-
-
-@kernel
-def relu_zeros(A: Param, C: Param):
-    """VRELU on all zeros — should remain zero."""
+def relu_vec(A: Param, C: Param):
+    """VRELU of one 8-element vector: C = max(A, 0)."""
     from compiler.tpu_txt import vload, vrelu, vstore
     vload(0, A)
     vrelu(1, 0)
@@ -159,47 +104,19 @@ def all_regs(
     D4: Param, D5: Param, D6: Param, D7: Param,
     Out: Param,
 ):
-    """Load all 8 registers V0-V7, chain adds, store result.
-    V0..V7 = D0..D7, then V0 = V0+V1, V0 = V0+V2, ..., V0 = V0+V7."""
+    """Load all 8 registers V0-V7, reduce them pairwise, store result.
+    V0..V7 = D0..D7, then a balanced tree of 7 adds leaves the sum in V0:
+    V0+=V1, V2+=V3, V4+=V5, V6+=V7; V0+=V2, V4+=V6; V0+=V4."""
     from compiler.tpu_txt import vload, vadd, vstore
-    vload(0, D0)
-    vload(1, D1)
-    vload(2, D2)
-    vload(3, D3)
-    vload(4, D4)
-    vload(5, D5)
-    vload(6, D6)
-    vload(7, D7)
-    vadd(0, 0, 1)   # V0 = V0 + V1
-    vadd(0, 0, 2)   # V0 = V0 + V2
-    vadd(0, 0, 3)   # V0 = V0 + V3
-    vadd(0, 0, 4)   # V0 = V0 + V4
-    vadd(0, 0, 5)   # V0 = V0 + V5
-    vadd(0, 0, 6)   # V0 = V0 + V6
-    vadd(0, 0, 7)   # V0 = V0 + V7
+    for reg, src in enumerate((D0, D1, D2, D3, D4, D5, D6, D7)):
+        vload(reg, src)     # V<reg> = D<reg>
+    # Adds within a level are independent; the dependency chain is 3 deep
+    for stride in (1, 2, 4):
+        for reg in range(0, 8, 2 * stride):
+            vadd(reg, reg, reg + stride)
     vstore(0, Out)
 
 
-@kernel
-def large_values(A: Param, B: Param, C: Param):
-    """VADD with large FP32 values near overflow boundary."""
-    from compiler.tpu_txt import vload, vadd, vstore
-    vload(0, A)
-    vload(1, B)
-    vadd(2, 0, 1)
-    vstore(2, C)
-
-
-@kernel
-def small_values(A: Param, B: Param, C: Param):
-    """VMUL with very small FP32 values (near underflow)."""
-    from compiler.tpu_txt import vload, vmul, vstore
-    vload(0, A)
-    vload(1, B)
-    vmul(2, 0, 1)
-    vstore(2, C)
-
-
 @kernel
 def scalar_add_broadcast(A: Param, S: Param, C: Param):
     """VADD with scalar broadcast: C[i] = A[i] + S[0]."""
@@ -210,90 +127,81 @@ def scalar_add_broadcast(A: Param, S: Param, C: Param):
     vstore(2, C)
 
 
-@kernel
-def mul_negone(A: Param, NegOnes: Param, C: Param):
-    """VMUL by -1.0 should negate all values."""
-    from compiler.tpu_txt import vload, vmul, vstore
-    vload(0, A)
-    vload(1, NegOnes)
-    vmul(2, 0, 1)
-    vstore(2, C)
-
-
 # ============================================================================
 # Build program
 # ============================================================================
 
+# One entry per test, in program order: (kernel, {param: buffer name}).
+# Buffer names are the ones allocated in build_edge_case_program.
+EDGE_CASE_CALLS = [
+    (add_vec, {"A": "zeros", "B": "zeros", "C": "out_add_zeros"}),          # 1  zeros + zeros
+    (mul_vec, {"A": "zeros", "B": "zeros", "C": "out_mul_zeros"}),          # 2  zeros * zeros
+    (add_vec, {"A": "all_neg", "B": "all_neg", "C": "out_add_neg"}),        # 3  all-negative inputs
+    (add_vec, {"A": "input_a", "B": "neg_a", "C": "out_cancel"}),           # 4  B = -A cancels to zero
+    (mul_vec, {"A": "input_a", "B": "ones", "C": "out_mul_identity"}),      # 5  * 1.0 preserves input
+    (add_vec, {"A": "input_a", "B": "zeros", "C": "out_add_identity"}),     # 6  + 0.0 preserves input
+    (self_add, {"A": "input_a", "C": "out_self_add"}),                      # 7
+    (sub_basic, {"A": "input_a", "B": "input_b", "C": "out_sub"}),          # 8
+    (sub_self, {"A": "input_a", "C": "out_sub_self"}),                      # 9
+    (relu_vec, {"A": "all_pos", "C": "out_relu_pos"}),                      # 10 identity
+    (relu_vec, {"A": "all_neg", "C": "out_relu_neg"}),                      # 11 all become zero
+    (relu_vec, {"A": "zeros", "C": "out_relu_zero"}),                       # 12 stays zero
+    (chain_ops, {"A": "input_a", "B": "input_b", "C": "out_chain"}),        # 13
+    (all_regs, {**{f"D{i}": f"reg_d{i}" for i in range(8)},
+                "Out": "out_all_regs"}),                                    # 14
+    (add_vec, {"A": "large_a", "B": "large_b", "C": "out_large"}),          # 15 near overflow
+    (mul_vec, {"A": "small_a", "B": "small_b", "C": "out_small"}),          # 16 near underflow
+    (scalar_add_broadcast, {"A": "input_a", "S": "scalar_val",
+                            "C": "out_scalar_add"}),                        # 17
+    (mul_vec, {"A": "input_a", "B": "neg_ones", "C": "out_mul_negone"}),    # 18 * -1.0 negates
+]
+
+
 def build_edge_case_program() -> Program:
     prog = Program()
 
-    # Shared inputs
-    zeros = prog.alloc("zeros", 8)          # [0,0,...,0]
-    ones = prog.alloc("ones", 8)            # [1,1,...,1]
-    neg_ones = prog.alloc("neg_ones", 8)    # [-1,-1,...,-1]
-    input_a = prog.alloc("input_a", 8)      # [1..8]
-    neg_a = prog.alloc("neg_a", 8)          # [-1..-8]
-    input_b = prog.alloc("input_b", 8)      # [0.5,1.0,...,4.0]
-    all_neg = prog.alloc("all_neg", 8)      # [-10..-80]
-    all_pos = prog.alloc("all_pos", 8)      # [10..80]
-    large_a = prog.alloc("large_a", 8)      # [1e30, ...]
-    large_b = prog.alloc("large_b", 8)      # [1e30, ...]
-    small_a = prog.alloc("small_a", 8)      # [1e-20, ...]
-    small_b = prog.alloc("small_b", 8)      # [1e-20, ...]
-    scalar_val = prog.alloc("scalar_val", 1)  # single value for broadcast
-
-    # Register-all inputs (8 separate 8-element vectors)
-    reg_d0 = prog.alloc("reg_d0", 8)
-    reg_d1 = prog.alloc("reg_d1", 8)
-    reg_d2 = prog.alloc("reg_d2", 8)
-    reg_d3 = prog.alloc("reg_d3", 8)
-    reg_d4 = prog.alloc("reg_d4", 8)
-    reg_d5 = prog.alloc("reg_d5", 8)
-    reg_d6 = prog.alloc("reg_d6", 8)
-    reg_d7 = prog.alloc("reg_d7", 8)
-
-    # Output buffers (one per test)
-    out_add_zeros = prog.alloc("out_add_zeros", 8)          # Test 1
-    out_mul_zeros = prog.alloc("out_mul_zeros", 8)          # Test 2
-    out_add_neg = prog.alloc("out_add_neg", 8)              # Test 3
-    out_cancel = prog.alloc("out_cancel", 8)                # Test 4
-    out_mul_identity = prog.alloc("out_mul_identity", 8)    # Test 5
-    out_add_identity = prog.alloc("out_add_identity", 8)    # Test 6
-    out_self_add = prog.alloc("out_self_add", 8)            # Test 7
-    out_sub = prog.alloc("out_sub", 8)                      # Test 8
-    out_sub_self = prog.alloc("out_sub_self", 8)            # Test 9
-    out_relu_pos = prog.alloc("out_relu_pos", 8)            # Test 10
-    out_relu_neg = prog.alloc("out_relu_neg", 8)            # Test 11
-    out_relu_zero = prog.alloc("out_relu_zero", 8)          # Test 12
-    out_chain = prog.alloc("out_chain", 8)                  # Test 13
-    out_all_regs = prog.alloc("out_all_regs", 8)            # Test 14
-    out_large = prog.alloc("out_large", 8)                  # Test 15
-    out_small = prog.alloc("out_small", 8)                  # Test 16
-    out_scalar_add = prog.alloc("out_scalar_add", 8)        # Test 17
-    out_mul_negone = prog.alloc("out_mul_negone", 8)        # Test 18
-
-    # Kernel calls
-    prog.call(add_zeros, A=zeros, B=zeros, C=out_add_zeros)            # 1
-    prog.call(mul_zeros, A=zeros, B=zeros, C=out_mul_zeros)            # 2
-    prog.call(add_negatives, A=all_neg, B=all_neg, C=out_add_neg)      # 3
-    prog.call(add_cancellation, A=input_a, B=neg_a, C=out_cancel)      # 4
-    prog.call(mul_identity, A=input_a, Ones=ones, C=out_mul_identity)   # 5
-    prog.call(add_identity, A=input_a, Zeros=zeros, C=out_add_identity) # 6
-    prog.call(self_add, A=input_a, C=out_self_add)                      # 7
-    prog.call(sub_basic, A=input_a, B=input_b, C=out_sub)              # 8
-    prog.call(sub_self, A=input_a, C=out_sub_self)                      # 9
-    prog.call(relu_all_positive, A=all_pos, C=out_relu_pos)            # 10
-    prog.call(relu_all_negative, A=all_neg, C=out_relu_neg)            # 11
-    prog.call(relu_zeros, A=zeros, C=out_relu_zero)                     # 12
-    prog.call(chain_ops, A=input_a, B=input_b, C=out_chain)            # 13
-    prog.call(all_regs,                                                  # 14
-              D0=reg_d0, D1=reg_d1, D2=reg_d2, D3=reg_d3,
-              D4=reg_d4, D5=reg_d5, D6=reg_d6, D7=reg_d7,
-              Out=out_all_regs)
-    prog.call(large_values, A=large_a, B=large_b, C=out_large)         # 15
-    prog.call(small_values, A=small_a, B=small_b, C=out_small)         # 16
-    prog.call(scalar_add_broadcast, A=input_a, S=scalar_val, C=out_scalar_add)  # 17
-    prog.call(mul_negone, A=input_a, NegOnes=neg_ones, C=out_mul_negone)        # 18
+    a = prog.alloc_many([
+        # Shared inputs
+        ("zeros", 8),           # [0,0,...,0]
+        ("ones", 8),            # [1,1,...,1]
+        ("neg_ones", 8),        # [-1,-1,...,-1]
+        ("input_a", 8),         # [1..8]
+        ("neg_a", 8),           # [-1..-8]
+        ("input_b", 8),         # [0.5,1.0,...,4.0]
+        ("all_neg", 8),         # [-10..-80]
+        ("all_pos", 8),         # [10..80]
+        ("large_a", 8),         # [1e30, ...]
+        ("large_b", 8),         # [1e30, ...]
+        ("small_a", 8),         # [1e-20, ...]
+        ("small_b", 8),         # [1e-20, ...]
+        ("scalar_val", 1),      # single value for broadcast
+
+        # Register-all inputs (8 separate 8-element vectors)
+        *[(f"reg_d{i}", 8) for i in range(8)],
+
+        # Output buffers (one per test)
+        ("out_add_zeros", 8),       # Test 1
+        ("out_mul_zeros", 8),       # Test 2
+        ("out_add_neg", 8),         # Test 3
+        ("out_cancel", 8),          # Test 4
+        ("out_mul_identity", 8),    # Test 5
+        ("out_add_identity", 8),    # Test 6
+        ("out_self_add", 8),        # Test 7
+        ("out_sub", 8),             # Test 8
+        ("out_sub_self", 8),        # Test 9
+        ("out_relu_pos", 8),        # Test 10
+        ("out_relu_neg", 8),        # Test 11
+        ("out_relu_zero", 8),       # Test 12
+        ("out_chain", 8),           # Test 13
+        ("out_all_regs", 8),        # Test 14
+        ("out_large", 8),           # Test 15
+        ("out_small", 8),           # Test 16
+        ("out_scalar_add", 8),      # Test 17
+        ("out_mul_negone", 8),      # Test 18
+    ])
+
+    for kern, buffers in EDGE_CASE_CALLS:
+        prog.call(kern, **{param: a[buf] for param, buf in buffers.items()})
 
     return prog
 
@@ -305,22 +213,17 @@ def main():
 
     npy_path = output_dir / "simd_edge_cases.npy"
     hex_path = output_dir / "simd_edge_cases.hex"
-    n_instr = prog.save(npy_path)
-    prog.save(hex_path)
+    n_instr = prog.save_both(npy_path, hex_path)
 
     print(f"Compiled {n_instr} instructions")
     print(f"  {npy_path}")
     print(f"  {hex_path}")
 
-    import json
     meta_path = output_dir / "simd_edge_cases_meta.json"
-    memory_map = {name: {"addr": addr, "size": size}
-                  for name, (addr, size) in prog.get_memory_map().items()}
-    with open(meta_path, 'w') as f:
-        json.dump(memory_map, f, indent=2)
-    print(f"  {meta_path}")
+    written = prog.save_memory_map(meta_path)
+    print(f"  {meta_path}" + ("" if written else " (unchanged)"))
 
-    print(f"\n18 edge case tests, {n_instr} instructions total")
+    print(f"\n{len(EDGE_CASE_CALLS)} edge case tests, {n_instr} instructions total")
 
 
 if __name__ == "__main__":
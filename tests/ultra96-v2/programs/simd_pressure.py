@@ -52,11 +52,10 @@ def scalar_mul_32(A: Param, B: Param, C: Param):
 def scalar_mlp_32(X: Param, W: Param, Bias: Param, Zero: Param, Y: Param):
     """32-element fused MLP: Y = ReLU(X*W + Bias). 96 instructions."""
     from compiler.tpu_txt import mul, add, relu
+    # One element at a time, so each op consumes the previous op's result
     for i in range(32):
         mul(X + i, W + i, Y + i)       # Y[i] = X[i] * W[i]
-    for i in range(32):
         add(Y + i, Bias + i, Y + i)    # Y[i] = Y[i] + Bias[i]
-    for i in range(32):
         relu(Y + i, Zero, Y + i)       # Y[i] = ReLU(Y[i])
 
 
@@ -72,55 +71,76 @@ def scalar_add_64(A: Param, B: Param, C: Param):
 # SIMD kernels (8 elements per instruction)
 # ============================================================================
 
+def _simd_pointwise(op, n, A, B, C, unroll=1):
+    """Emit C = op(A, B) over n elements, one vload/vload/op/vstore per 8.
+
+    With unroll=2, pairs of chunks use separate register banks (V0-V2 and
+    V3-V5): both chunks' loads are issued first, then two independent ops,
+    then both stores.
+    """
+    from compiler.tpu_txt import vload, vstore
+    if unroll not in (1, 2) or n % (8 * unroll):
+        raise ValueError(f"cannot split {n} elements into {unroll}-chunk groups")
+    banks = [(3 * j, 3 * j + 1, 3 * j + 2) for j in range(unroll)]
+    for group in range(0, n // 8, unroll):
+        offs = [(group + j) * 8 for j in range(unroll)]
+        for (va, vb, _), off in zip(banks, offs):
+            vload(va, A + off)
+            vload(vb, B + off)
+        for va, vb, vc in banks:
+            op(vc, va, vb)
+        for (_, _, vc), off in zip(banks, offs):
+            vstore(vc, C + off)
+
+
 @kernel
 def simd_add_32(A: Param, B: Param, C: Param):
     """32-element add using SIMD VPU: 16 instructions."""
-    from compiler.tpu_txt import vload, vadd, vstore
-    for chunk in range(4):
-        off = chunk * 8
-        vload(0, A + off)
-        vload(1, B + off)
-        vadd(2, 0, 1)
-        vstore(2, C + off)
+    from compiler.tpu_txt import vadd
+    _simd_pointwise(vadd, 32, A, B, C)
 
 
 @kernel
 def simd_mul_32(A: Param, B: Param, C: Param):
     """32-element mul using SIMD VPU: 16 instructions."""
-    from compiler.tpu_txt import vload, vmul, vstore
-    for chunk in range(4):
-        off = chunk * 8
-        vload(0, A + off)
-        vload(1, B + off)
-        vmul(2, 0, 1)
-        vstore(2, C + off)
+    from compiler.tpu_txt import vmul
+    _simd_pointwise(vmul, 32, A, B, C)
 
 
 @kernel
 def simd_mlp_32(X: Param, W: Param, Bias: Param, Y: Param):
-    """32-element fused MLP: Y = ReLU(X*W + Bias). 28 instructions."""
+    """32-element fused MLP: Y = ReLU(X*W + Bias). 28 instructions.
+
+    Software-pipelined: the loads for chunk k+1 are issued before the
+    arithmetic for chunk k, alternating between register banks V0-V2 and
+    V5-V7 so the early loads never overwrite operands still in use.
+    """
     from compiler.tpu_txt import vload, vmul, vadd, vrelu, vstore
-    for chunk in range(4):
+    banks = ((0, 1, 2), (5, 6, 7))
+
+    def load_chunk(chunk):
+        vx, vw, vb = banks[chunk % 2]
         off = chunk * 8
-        vload(0, X + off)
-        vload(1, W + off)
-        vload(2, Bias + off)
-        vmul(3, 0, 1)       # V3 = X * W
-        vadd(4, 3, 2)       # V4 = V3 + Bias
-        vrelu(5, 4)         # V5 = ReLU(V4)
-        vstore(5, Y + off)
+        vload(vx, X + off)
+        vload(vw, W + off)
+        vload(vb, Bias + off)
+
+    load_chunk(0)                           # Prologue
+    for chunk in range(4):
+        if chunk + 1 < 4:
+            load_chunk(chunk + 1)           # Next chunk's operands
+        vx, vw, vb = banks[chunk % 2]
+        vmul(3, vx, vw)     # V3 = X * W
+        vadd(4, 3, vb)      # V4 = V3 + Bias
+        vrelu(3, 4)         # V3 = ReLU(V4)
+        vstore(3, Y + chunk * 8)
 
 
 @kernel
 def simd_add_64(A: Param, B: Param, C: Param):
-    """64-element add using SIMD VPU: 32 instructions."""
-    from compiler.tpu_txt import vload, vadd, vstore
-    for chunk in range(8):
-        off = chunk * 8
-        vload(0, A + off)
-        vload(1, B + off)
-        vadd(2, 0, 1)
-        vstore(2, C + off)
+    """64-element add using SIMD VPU: 32 instructions, unrolled by 2."""
+    from compiler.tpu_txt import vadd
+    _simd_pointwise(vadd, 64, A, B, C, unroll=2)
 
 
 # ============================================================================
@@ -129,20 +149,20 @@ def simd_add_64(A: Param, B: Param, C: Param):
 
 def alloc_shared(prog):
     """Allocate shared memory layout. Both programs must call this identically."""
-    layout = {}
-    layout["vec_a_32"] = prog.alloc("vec_a_32", 32)
-    layout["vec_b_32"] = prog.alloc("vec_b_32", 32)
-    layout["add_out_32"] = prog.alloc("add_out_32", 32)
-    layout["mul_out_32"] = prog.alloc("mul_out_32", 32)
-    layout["mlp_x"] = prog.alloc("mlp_x", 32)
-    layout["mlp_w"] = prog.alloc("mlp_w", 32)
-    layout["mlp_bias"] = prog.alloc("mlp_bias", 32)
-    layout["mlp_out"] = prog.alloc("mlp_out", 32)
-    layout["zero"] = prog.alloc("zero", 1)
-    layout["vec_a_64"] = prog.alloc("vec_a_64", 64)
-    layout["vec_b_64"] = prog.alloc("vec_b_64", 64)
-    layout["add_out_64"] = prog.alloc("add_out_64", 64)
-    return layout
+    return prog.alloc_many([
+        ("vec_a_32", 32),
+        ("vec_b_32", 32),
+        ("add_out_32", 32),
+        ("mul_out_32", 32),
+        ("mlp_x", 32),
+        ("mlp_w", 32),
+        ("mlp_bias", 32),
+        ("mlp_out", 32),
+        ("zero", 1),
+        ("vec_a_64", 64),
+        ("vec_b_64", 64),
+        ("add_out_64", 64),
+    ])
 
 
 def build_scalar_program() -> Program:
@@ -195,13 +215,9 @@ def main():
         return 1
 
     # Save memory map (same for both programs)
-    import json
     meta_path = output_dir / "pressure_meta.json"
-    memory_map = {name: {"addr": addr, "size": size}
-                  for name, (addr, size) in simd_prog.get_memory_map().items()}
-    with open(meta_path, 'w') as f:
-        json.dump(memory_map, f, indent=2)
-    print(f"Memory map:     {meta_path}")
+    written = simd_prog.save_memory_map(meta_path)
+    print(f"Memory map:     {meta_path}" + ("" if written else " (unchanged)"))
 
     print(f"\nInstruction count comparison:")
     print(f"  Scalar: {n_scalar} instructions (IRAM limit: {IRAM_DEPTH})")
@@ -3,8 +3,8 @@ import argparse
 import sys
 import time
 import os
-import ast
 import re
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 # Add compiler path if needed, assuming running from tests/fpga or similar
@@ -17,12 +17,26 @@ except ImportError as e:
     print(f"Warning: Could not import TpuDriver: {e}")
     TpuDriver = None
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # --- Auto-injected ---
 LOADS = [(0, 1, [0.0]), (217, 1, [0.0]), (250, 1, [0.0625]), (251, 1, [0.125]), (252, 1, [0.25]), (17, 16, [0.5349372625350952, -0.42807283997535706, 0.6224414706230164, 0.412855863571167, -0.1609402596950531, 0.45991650223731995, -0.008394825272262096, -1.0810587406158447, -0.4092785120010376, 0.33538737893104553, 0.7745689749717712, 1.246403455734253, 0.06053096055984497, -0.4809349775314331, 2.8815693855285645, 0.3675261437892914]), (1, 16, [-2.011988639831543, -1.096235752105713, 0.28206828236579895, 1.3023632764816284, -2.6207454204559326, 0.5203536748886108, -0.7461836934089661, -1.4004322290420532, -0.3369337022304535, -0.4005471169948578, -0.5305342674255371, -0.8704047203063965, -1.2647355794906616, -0.6878875494003296, -1.266802430152893, -1.1686781644821167]), (65, 4, [-0.23962494730949402, 0.5054038166999817, -0.19779425859451294, 1.5840543508529663]), (101, 16, [0.9468435049057007, -0.400322824716568, 0.29833781719207764, 0.03668760135769844, -1.5196205377578735, -0.7553608417510986, 0.008393446914851665, 0.15188133716583252, -0.2558029294013977, 1.2145031690597534, -0.7655883431434631, 1.3448312282562256, 0.7687711119651794, -0.3062424957752228, -0.2469402551651001, 0.8169132471084595])]
 STORES = [(1, 16, 'X'), (17, 16, 'W'), (33, 16, 'Z'), (65, 4, 'b'), (49, 16, 'W.T'), (69, 16, 'Y'), (85, 16, 'A'), (185, 16, 'diff'), (201, 16, 'sqaured'), (117, 16, 'dA'), (133, 16, 'dZ'), (149, 16, 'dW'), (165, 4, 'db'), (169, 16, 'dX'), (233, 1, 'loss')]
 
-_TRACE_LOAD_RE = re.compile(r"^load (\d+), (\d+), (\[.*\])$")
-_TRACE_STORE_RE = re.compile(r"^store (\d+), (\d+), (.+)$")
+# LOADS flattened once at import: load i writes
+# _LOAD_DATA[_LOAD_OFFS[i]:_LOAD_OFFS[i] + _LOAD_LENS[i]] to _LOAD_ADDRS[i]
+_LOAD_ADDRS = np.fromiter((addr for addr, _, _ in LOADS), dtype=np.int64, count=len(LOADS))
+_LOAD_LENS = np.fromiter((length for _, length, _ in LOADS), dtype=np.int64, count=len(LOADS))
+_LOAD_OFFS = np.concatenate(([0], np.cumsum(_LOAD_LENS[:-1]))).astype(np.int64)
+_LOAD_DATA = np.concatenate([np.asarray(values, dtype=np.float32) for _, _, values in LOADS]
+                            or [np.zeros(0, dtype=np.float32)])
+_LOAD_SLICES = [(addr, _LOAD_DATA[off:off + length])
+                for addr, off, length in zip(_LOAD_ADDRS.tolist(), _LOAD_OFFS.tolist(), _LOAD_LENS.tolist())]
+
+_TRACE_MEM_RE = re.compile(r"^(load|store)\s+(\d+),\s*(\d+),\s*(.+)$")
 
 
 def _default_trace_path():
@@ -47,24 +61,23 @@ def _load_trace_ops(trace_path):
             line = raw.strip()
             if not line:
                 continue
-            if line.startswith("load "):
-                match = _TRACE_LOAD_RE.match(line)
+            if line.startswith(("load ", "store ")):
+                match = _TRACE_MEM_RE.match(line)
                 if not match:
+                    raise ValueError(f"Unrecognized {line.split()[0]} format: {line}")
+                name, addr, length, rest = match.groups()
+                addr, length = int(addr), int(length)
+                if name == "store":
+                    ops.append(("store", addr, length, rest.strip()))
+                    continue
+                if not (rest.startswith("[") and rest.endswith("]")):
                     raise ValueError(f"Unrecognized load format: {line}")
-                addr = int(match.group(1))
-                length = int(match.group(2))
-                values = ast.literal_eval(match.group(3))
+                # Parse straight into float32 rather than via a list of Python floats
+                values = np.fromstring(rest[1:-1], sep=",", dtype=np.float32)
+                if len(values) != length:
+                    raise ValueError(f"Load expects {length} values, got {len(values)}: {line}")
                 ops.append(("load", addr, length, values))
                 continue
-            if line.startswith("store "):
-                match = _TRACE_STORE_RE.match(line)
-                if not match:
-                    raise ValueError(f"Unrecognized store format: {line}")
-                addr = int(match.group(1))
-                length = int(match.group(2))
-                label = match.group(3).strip()
-                ops.append(("store", addr, length, label))
-                continue
             parts = [p.strip() for p in line.split()]
             op = parts[0]
             if op in {"add", "sub", "mul", "relu", "relu_derivative", "matmul"}:
@@ -77,8 +90,8 @@ def _load_trace_ops(trace_path):
 
 def _init_mem_from_loads(size):
     mem = np.zeros(size, dtype=np.float32)
-    for addr, length, values in LOADS:
-        mem[addr:addr + length] = np.array(values, dtype=np.float32)
+    for addr, data in _LOAD_SLICES:
+        mem[addr:addr + len(data)] = data
     return mem
 
 
@@ -105,13 +118,111 @@ def _mem_size_hint(trace_ops, tile_size):
     return max_addr + 1
 
 
+# Opcodes for the compiled trace interpreter (see _lower_trace)
+_OP_CODES = {"load": 0, "store": 1, "add": 2, "sub": 3, "mul": 4,
+             "relu": 5, "relu_derivative": 6, "matmul": 7}
+
+
+def _lower_trace(trace_ops):
+    """Flatten trace ops into typed arrays for _exec_trace.
+
+    Returns (codes, args, load_data): codes[i] is the opcode of op i and
+    args[i] its three address operands. For a load, args[i] holds
+    (addr, length, offset) and the values sit at load_data[offset:offset + length].
+    """
+    codes = np.empty(len(trace_ops), dtype=np.int8)
+    args = np.zeros((len(trace_ops), 3), dtype=np.int32)
+    chunks = []
+    offset = 0
+    for i, op in enumerate(trace_ops):
+        name = op[0]
+        if name not in _OP_CODES:
+            raise ValueError(f"Unsupported op in trace: {op}")
+        codes[i] = _OP_CODES[name]
+        if name == "load":
+            _, addr, length, values = op
+            args[i] = (addr, length, offset)
+            chunks.append(np.asarray(values, dtype=np.float32))
+            offset += length
+        elif name != "store":
+            args[i] = op[1:4]
+    load_data = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+    return codes, args, load_data
+
+
+def _tile_matmul_BAt(A, B, C, ts):
+    """C = B @ A^T for flat row-major ts x ts tiles, without reshaping."""
+    for r in range(ts):
+        for col in range(ts):
+            acc = np.float32(0.0)
+            for k in range(ts):
+                acc += B[r * ts + k] * A[col * ts + k]
+            C[r * ts + col] = acc
+
+
+if njit is not None:
+    _tile_matmul_BAt = njit(inline="always")(_tile_matmul_BAt)
+
+
+def _exec_trace(codes, args, load_data, mem, tile_size):
+    """Run a lowered trace on mem in place; compiled with numba when available."""
+    n = tile_size * tile_size
+    # Matmul results go through a scratch tile so an output that overlaps
+    # an input is only written once the product is complete
+    tile = np.empty(n, dtype=np.float32)
+    for i in range(codes.shape[0]):
+        code = codes[i]
+        a = args[i, 0]
+        b = args[i, 1]
+        c = args[i, 2]
+        if code == 0:  # load: a=addr, b=length, c=offset into load_data
+            mem[a:a + b] = load_data[c:c + b]
+        elif code == 2:
+            mem[c] = mem[a] + mem[b]
+        elif code == 3:
+            mem[c] = mem[a] - mem[b]
+        elif code == 4:
+            mem[c] = mem[a] * mem[b]
+        elif code == 5:
+            mem[c] = mem[a] if mem[a] > 0 else 0.0
+        elif code == 6:
+            mem[c] = 1.0 if mem[a] > 0 else 0.0
+        elif code == 7:
+            # C = B @ A^T, as in _interpret_trace
+            _tile_matmul_BAt(mem[a:a + n], mem[b:b + n], tile, tile_size)
+            mem[c:c + n] = tile
+
+
+if njit is not None:
+    # nogil lets main() overlap the simulation with FPGA programming
+    _exec_trace = njit(cache=True, nogil=True)(_exec_trace)
+
+
 def _run_trace(trace_ops, tile_size):
     mem = _init_mem_from_loads(_mem_size_hint(trace_ops, tile_size))
+    if njit is not None:
+        _exec_trace(*_lower_trace(trace_ops), mem, tile_size)
+    else:
+        _interpret_trace(trace_ops, mem, tile_size)
+    expected = {}
+    for addr, length, label in STORES:
+        expected[label] = mem[addr:addr + length].copy()
+    return expected
+
+
+def _expected_from_trace(trace_path, tile_size):
+    return _run_trace(_load_trace_ops(trace_path), tile_size)
+
+
+def _interpret_trace(trace_ops, mem, tile_size):
+    """Pure-Python reference interpreter, used when numba is not installed."""
+    # mem is float32, so the scalar results below are stored as float32
+    # without wrapping each one in np.float32
     for op in trace_ops:
         name = op[0]
         if name == "load":
             _, addr, length, values = op
-            mem[addr:addr + length] = np.array(values, dtype=np.float32)
+            mem[addr:addr + length] = values
         elif name == "matmul":
             _, a, b, c = op
             # Hardware systolic array computes: C = B @ A^T
@@ -122,27 +233,23 @@ def _run_trace(trace_ops, tile_size):
             mem[c:c + tile_size * tile_size] = C.reshape(-1)
         elif name == "add":
             _, a, b, c = op
-            mem[c] = np.float32(mem[a] + mem[b])
+            mem[c] = mem[a] + mem[b]
         elif name == "sub":
             _, a, b, c = op
-            mem[c] = np.float32(mem[a] - mem[b])
+            mem[c] = mem[a] - mem[b]
         elif name == "mul":
             _, a, b, c = op
-            mem[c] = np.float32(mem[a] * mem[b])
+            mem[c] = mem[a] * mem[b]
         elif name == "relu":
             _, a, _, c = op
-            mem[c] = np.float32(mem[a] if mem[a] > 0 else 0.0)
+            mem[c] = mem[a] if mem[a] > 0 else 0.0
         elif name == "relu_derivative":
             _, a, _, c = op
-            mem[c] = np.float32(1.0 if mem[a] > 0 else 0.0)
+            mem[c] = 1.0 if mem[a] > 0 else 0.0
         elif name == "store":
             continue
         else:
             raise ValueError(f"Unsupported op in trace: {op}")
-    expected = {}
-    for addr, length, label in STORES:
-        expected[label] = mem[addr:addr + length].copy()
-    return expected
 
 
 def _compare_results(expected, actual, atol=1e-3, rtol=1e-4):
@@ -190,8 +297,22 @@ def main():
     if trace_paths and len(trace_paths) not in {1, len(args.instr_file)}:
         raise ValueError("Provide either one trace file or one per instruction file.")
 
-    print(f"Programming FPGA with {args.bitstream}")
-    tpu = TpuDriver(args.bitstream)
+    tile_size = _infer_tile_size()
+
+    # Each distinct trace is parsed and simulated once, however many
+    # instruction files share it. The simulation runs on a worker thread
+    # while the bitstream is programmed, and is collected before the
+    # benchmarked section so it never lands inside a timed window.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        futures = {}
+        if not args.no_ref:
+            for trace_path in dict.fromkeys(trace_paths):
+                futures[trace_path] = executor.submit(_expected_from_trace, trace_path, tile_size)
+
+        print(f"Programming FPGA with {args.bitstream}")
+        tpu = TpuDriver(args.bitstream)
+
+        expected_by_trace = {path: fut.result() for path, fut in futures.items()}
 
     bench = {
         "load_time": 0.0,
@@ -203,35 +324,27 @@ def main():
 
     overall_start = time.perf_counter()
 
-    tile_size = _infer_tile_size()
     all_ok = True
 
     for idx, instr_path in enumerate(args.instr_file):
         trace_path = None
         if trace_paths:
             trace_path = trace_paths[0] if len(trace_paths) == 1 else trace_paths[idx]
-        expected = None
-        if trace_path and not args.no_ref:
-            trace_ops = _load_trace_ops(trace_path)
-            expected = _run_trace(trace_ops, tile_size)
+        expected = expected_by_trace.get(trace_path)
 
         # Load data to BRAM
         print(f"Loading data for program {idx + 1}...")
         t0 = time.perf_counter()
-        for addr, length, values in LOADS:
-            tpu.write_bram(addr, np.array(values, dtype=np.float32))
+        for addr, data in _LOAD_SLICES:
+            tpu.write_bram(addr, data)
         bench["load_time"] += time.perf_counter() - t0
         print("loading data complete")
 
         # Load instructions
         print(f"Loading instructions from {instr_path}...")
-        instrs = []
         with open(instr_path) as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    instrs.append(int(line, 16))
-        instrs_np = np.array(instrs, dtype=np.uint64)
+            words = f.read().split()
+        instrs_np = np.fromiter((int(w, 16) for w in words), dtype=np.uint64, count=len(words))
 
         t0 = time.perf_counter()
         tpu.write_instructions(instrs_np)
@@ -36,13 +36,10 @@ def load_program(path):
     if path.suffix == '.npy':
         return np.load(path)
     else:
-        instructions = []
+        # One hex word per line; blank lines and '#' comments are skipped
         with open(path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    instructions.append(int(line, 16))
-        return np.array(instructions, dtype=np.uint64)
+            words = [w for w in map(str.strip, f) if w and not w.startswith('#')]
+        return np.fromiter((int(w, 16) for w in words), dtype=np.uint64, count=len(words))
 
 
 def main():
@@ -26,24 +26,16 @@ def encode_matmul(addr_w, addr_x, addr_z, length=16):
 def to_tile_major(mat, tile_size=4):
     """Convert row-major to tile-major."""
     rows, cols = mat.shape
-    result = []
-    for ti in range(rows // tile_size):
-        for tj in range(cols // tile_size):
-            tile = mat[ti*tile_size:(ti+1)*tile_size, tj*tile_size:(tj+1)*tile_size]
-            result.extend(tile.flatten().tolist())
-    return np.array(result, dtype=np.float32)
+    t = tile_size
+    tiles = mat.reshape(rows // t, t, cols // t, t).transpose(0, 2, 1, 3)
+    return tiles.reshape(-1).astype(np.float32, copy=False)
 
 
 def from_tile_major(data, rows, cols, tile_size=4):
     """Convert tile-major to row-major."""
-    mat = np.zeros((rows, cols), dtype=np.float32)
-    idx = 0
-    for ti in range(rows // tile_size):
-        for tj in range(cols // tile_size):
-            tile = data[idx:idx + tile_size*tile_size].reshape(tile_size, tile_size)
-            mat[ti*tile_size:(ti+1)*tile_size, tj*tile_size:(tj+1)*tile_size] = tile
-            idx += tile_size * tile_size
-    return mat
+    t = tile_size
+    tiles = np.asarray(data)[:rows * cols].reshape(rows // t, cols // t, t, t)
+    return tiles.transpose(0, 2, 1, 3).reshape(rows, cols).astype(np.float32, copy=False)
 
 
 def main():
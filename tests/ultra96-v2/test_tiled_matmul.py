@@ -44,13 +44,8 @@ def generate_tiled_matmul_trace(M, N, K, tile_size=4):
     # Convert to tile-major format
     def to_tile_major(mat, tile_size):
         rows, cols = mat.shape
-        result = []
-        for ti in range(rows // tile_size):
-            for tj in range(cols // tile_size):
-                tile = mat[ti*tile_size:(ti+1)*tile_size,
-                          tj*tile_size:(tj+1)*tile_size]
-                result.extend(tile.flatten().tolist())
-        return result
+        t = tile_size
+        return mat.reshape(rows // t, t, cols // t, t).transpose(0, 2, 1, 3).reshape(-1)
 
     X_tiled = to_tile_major(X_data, tile_size)
     W_tiled = to_tile_major(W_data, tile_size)